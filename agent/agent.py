@@ -1,9 +1,10 @@
 """ADK Web entrypoint - expone orchestrator como root_agent."""
 
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
 from google.adk.tools import AgentTool
 
+from src.agent.llm import get_llm_model
+from src.agent.sub_agents.rag_agent import create_search_tool
 from src.config.settings import get_settings
 from src.rag.vector_store import VectorStoreManager
 
@@ -11,17 +12,18 @@ settings = get_settings()
 vector_store = VectorStoreManager(settings)
 vector_store.load_existing()
 
-model = LiteLlm(
-    model=f"ollama_chat/{settings.ollama_llm_model}",
-    api_base=settings.ollama_base_url,
-)
+model = get_llm_model(settings)
 
 # RAG Agent
 rag_agent = Agent(
     model=model,
     name="rag_agent",
     description="Agente especializado en búsqueda de documentos",
-    instruction="Eres un asistente especializado en buscar información en documentos.",
+    instruction=(
+        "Eres un asistente especializado en buscar información en documentos. "
+        "Usa la tool search_documents y cita el source_id de cada fragmento."
+    ),
+    tools=[create_search_tool(vector_store, settings)],
 )
 
 # Web Agent
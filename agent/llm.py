@@ -0,0 +1,74 @@
+"""Configuración del modelo LLM con Ollama."""
+
+from collections.abc import AsyncGenerator
+
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.models.lite_llm import LiteLlm
+from google.genai import types
+
+from src.config.settings import Settings, get_settings
+from src.utils.admission import get_admission_controller
+
+
+class AdmittedLiteLlm(LiteLlm):
+    """LiteLlm que ocupa un slot LLM del control de admisión en cada llamada."""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        """
+        Genera la respuesta del modelo dentro de un slot LLM.
+
+        Args:
+            llm_request: Petición al modelo
+            stream: Si se devuelve la respuesta en streaming
+
+        Yields:
+            Respuestas del modelo
+        """
+        async with get_admission_controller().llm_call():
+            async for response in super().generate_content_async(llm_request, stream):
+                yield response
+
+
+def get_llm_model(settings: Settings | None = None) -> LiteLlm:
+    """
+    Obtiene el modelo LLM de Ollama vía LiteLLM.
+
+    `keep_alive` mantiene el modelo cargado entre llamadas y `num_ctx` fijo
+    evita que Ollama recargue el modelo al cambiar el tamaño de contexto; con
+    ambos, Ollama reutiliza la caché KV del prefijo común (system prompt) y
+    solo procesa el sufijo variable de cada petición.
+
+    Args:
+        settings: Configuración del sistema (opcional)
+
+    Returns:
+        LiteLlm: Modelo configurado
+    """
+    if settings is None:
+        settings = get_settings()
+
+    return AdmittedLiteLlm(
+        model=f"ollama_chat/{settings.ollama_llm_model}",
+        api_base=settings.ollama_base_url,
+        keep_alive=settings.ollama_keep_alive,
+        num_ctx=settings.ollama_num_ctx,
+    )
+
+
+def static_instruction(text: str) -> types.Content:
+    """
+    Envuelve un system prompt para usarlo como `static_instruction` de ADK.
+
+    ADK envía la instrucción estática literalmente al inicio del system
+    prompt, sin plantillas de estado, de modo que el prefijo es idéntico en
+    todas las llamadas.
+
+    Args:
+        text: Texto del system prompt
+
+    Returns:
+        Contenido listo para `Agent(static_instruction=...)`
+    """
+    return types.Content(role="system", parts=[types.Part(text=text)])
@@ -1,39 +1,22 @@
 """Orchestrator Agent - Coordina los sub-agentes."""
 
+import asyncio
 import logging
+import time
 
 from google.adk.agents import Agent
 from google.adk.tools import AgentTool
-from google.adk.models.lite_llm import LiteLlm
 
+from src.agent.llm import get_llm_model, static_instruction
+from src.agent.runtime import create_runner, run_agent_query
+from src.agent.sub_agents.rag_agent import retrieve
 from src.config.settings import Settings, get_settings
+from src.rag.vector_store import VectorStoreManager
+from src.utils.admission import apply_load_budget, get_admission_controller
 
 logger = logging.getLogger(__name__)
 
-
-async def create_orchestrator_agent(
-    rag_agent: Agent, web_agent: Agent, settings: Settings | None = None
-) -> Agent:
-    """
-    Crea el agente orquestador que coordina los sub-agentes.
-
-    Args:
-        rag_agent: Agente RAG
-        web_agent: Agente Web
-        settings: Configuración del sistema (opcional)
-
-    Returns:
-        Agente orquestador configurado
-    """
-    if settings is None:
-        settings = get_settings()
-
-    model = LiteLlm(
-        model=f"ollama_chat/{settings.ollama_llm_model}",
-        api_base=settings.ollama_base_url,
-    )
-
-    system_prompt = """Eres un orquestador inteligente que coordina dos agentes especializados:
+ORCHESTRATOR_PROMPT_TEMPLATE = """Eres un orquestador inteligente que coordina dos agentes especializados:
 
 1. **rag_agent**: Especializado en buscar información en documentos específicos de la base de conocimiento
    - Usa este agente para preguntas sobre información contenida en documentos
@@ -52,23 +35,294 @@ Tu responsabilidad:
 Directrices de selección:
 - Si la pregunta parece requerir información de documentos específicos → usa rag_agent
 - Si la pregunta es de conocimiento general o conceptual → usa web_agent
-- Si tienes dudas, intenta primero con rag_agent, y si no hay resultados usa web_agent
+- {ambiguous_guideline}
 
 Responde siempre de forma directa y útil."""
 
+_AMBIGUOUS_GUIDELINES = {
+    "delegate": (
+        "Si tienes dudas, intenta primero con rag_agent, y si no hay resultados usa web_agent"
+    ),
+    "speculative": (
+        "Si tienes dudas, usa ask_rag_and_web, que consulta ambos agentes en paralelo"
+    ),
+}
+
+# Frases con las que los sub-agentes indican que no tienen una respuesta útil
+_INADEQUATE_MARKERS = (
+    "no tengo información",
+    "no tengo suficiente información",
+    "no encontré",
+    "no encuentro",
+    "no hay información",
+    "no se encontró",
+    "fuera de mi alcance",
+    "no estoy seguro",
+)
+
+
+def is_adequate_answer(answer: str) -> bool:
+    """
+    Determina si una respuesta de sub-agente es utilizable.
+
+    Args:
+        answer: Texto de la respuesta
+
+    Returns:
+        True si la respuesta no está vacía ni admite falta de información
+    """
+    text = answer.strip().lower()
+    return bool(text) and not any(marker in text for marker in _INADEQUATE_MARKERS)
+
+
+def build_orchestrator_prompt(mode: str) -> str:
+    """
+    Construye el system prompt del orquestador para un modo de ejecución.
+
+    El resultado depende solo del modo configurado, por lo que es constante
+    durante toda la vida del proceso.
+
+    Args:
+        mode: Modo del orquestador ("delegate" o "speculative")
+
+    Returns:
+        System prompt del orquestador
+    """
+    return ORCHESTRATOR_PROMPT_TEMPLATE.format(ambiguous_guideline=_AMBIGUOUS_GUIDELINES[mode])
+
+
+class SpeculativeExecutor:
+    """
+    Ejecuta rag_agent y web_agent en paralelo (hedged request).
+
+    Devuelve la primera respuesta adecuada, dando preferencia a rag_agent
+    si ambas terminan a la vez, y cancela la otra ejecución. Si ninguna es
+    adecuada, combina lo que haya devuelto cada agente.
+    """
+
+    def __init__(
+        self,
+        rag_agent: Agent,
+        web_agent: Agent,
+        settings: Settings,
+        vector_store_manager: VectorStoreManager | None = None,
+    ) -> None:
+        """
+        Inicializa el ejecutor especulativo.
+
+        Args:
+            rag_agent: Agente RAG
+            web_agent: Agente Web
+            settings: Configuración del sistema
+            vector_store_manager: Gestor de vector store para sondear la
+                recuperación en paralelo (opcional)
+        """
+        self.settings = settings
+        self.vector_store_manager = vector_store_manager
+        self.runners = {
+            rag_agent.name: create_runner(rag_agent, settings.app_name),
+            web_agent.name: create_runner(web_agent, settings.app_name),
+        }
+        self.preferred = rag_agent.name
+        self.wins: dict[str, int] = dict.fromkeys([*self.runners, "merged"], 0)
+
+    async def _timed_query(self, name: str, query: str) -> tuple[str, float]:
+        """Ejecuta un sub-agente y devuelve su respuesta junto con la latencia."""
+        start = time.perf_counter()
+        answer = await run_agent_query(self.runners[name], query)
+        return answer, time.perf_counter() - start
+
+    async def _has_relevant_context(self, query: str) -> bool:
+        """Comprueba si la recuperación encuentra algún fragmento relevante."""
+        with get_admission_controller().track_embedding():
+            scored = await asyncio.to_thread(
+                retrieve, self.vector_store_manager, query, self.settings.rag_max_k, self.settings
+            )
+        return bool(scored)
+
+    async def run(self, query: str) -> str:
+        """
+        Lanza ambos sub-agentes y resuelve con la primera respuesta adecuada.
+
+        Si hay vector store y k adaptativo, sondea también la recuperación en
+        paralelo: cuando no hay contexto relevante, rag_agent se cancela sin
+        esperar a su generación; cuando sí lo hay, se espera a rag_agent y
+        web_agent solo gana si la respuesta de rag_agent no es adecuada.
+
+        Args:
+            query: Pregunta del usuario
+
+        Returns:
+            Respuesta elegida o combinación de ambas
+        """
+        start = time.perf_counter()
+        tasks = {
+            asyncio.create_task(self._timed_query(name, query)): name for name in self.runners
+        }
+        agent_tasks = {name: task for task, name in tasks.items()}
+        pending = set(tasks)
+
+        probe: asyncio.Task | None = None
+        if self.vector_store_manager is not None and self.settings.rag_adaptive_k:
+            probe = asyncio.create_task(self._has_relevant_context(query))
+            pending.add(probe)
+
+        answers: dict[str, str] = {}
+        latencies: dict[str, float] = {}
+        skipped: set[str] = set()
+        # None mientras el sondeo no ha terminado (o si no hay sondeo)
+        has_context: bool | None = None
+
+        winner: str | None = None
+        try:
+            while winner is None and pending - {probe}:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is probe:
+                        try:
+                            has_context = task.result()
+                        except Exception as e:
+                            logger.warning(f"Speculative retrieval probe failed: {e}")
+                            has_context = True
+                        rag_task = agent_tasks[self.preferred]
+                        if not has_context and rag_task in pending:
+                            rag_task.cancel()
+                            pending.discard(rag_task)
+                            answers[self.preferred] = ""
+                            skipped.add(self.preferred)
+                        continue
+
+                    name = tasks[task]
+                    try:
+                        answers[name], latencies[name] = task.result()
+                    except Exception as e:
+                        logger.warning(f"Speculative {name} failed: {e}")
+                        answers[name] = ""
+                        latencies[name] = time.perf_counter() - start
+
+                winner = self._pick_winner(answers, has_context, probe is not None)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if winner is not None:
+            result = answers[winner]
+        else:
+            winner = "merged"
+            result = "\n\n".join(
+                f"[{name}] {answer.strip()}" for name, answer in answers.items() if answer.strip()
+            )
+
+        self.wins[winner] += 1
+        timings = ", ".join(
+            f"{name}={latencies[name]:.2f}s"
+            if name in latencies
+            else f"{name}={'no_context' if name in skipped else 'cancelled'}"
+            for name in self.runners
+        )
+        logger.info(
+            f"Hedged request: winner={winner} latency={time.perf_counter() - start:.2f}s "
+            f"({timings}) wins={self.wins}"
+        )
+        return result
+
+    def _pick_winner(
+        self, answers: dict[str, str], has_context: bool | None, probing: bool
+    ) -> str | None:
+        """
+        Elige la respuesta ganadora entre las recibidas hasta el momento.
+
+        `is_adequate_answer` solo detecta frases de falta de información, por
+        lo que web_agent (sin llamada a tools) ganaría casi siempre la carrera.
+        Mientras el sondeo indique contexto relevante, o no haya terminado, se
+        espera a rag_agent antes de aceptar otra respuesta.
+
+        Args:
+            answers: Respuestas recibidas por sub-agente
+            has_context: Resultado del sondeo de recuperación (None si no terminó)
+            probing: Si hay sondeo de recuperación en curso o terminado
+
+        Returns:
+            Nombre del ganador, o None si hay que seguir esperando
+        """
+        adequate = [name for name in answers if is_adequate_answer(answers[name])]
+        if self.preferred in adequate:
+            return self.preferred
+        if not adequate:
+            return None
+
+        if self.preferred not in answers and probing and has_context is not False:
+            return None
+
+        if self.preferred not in answers:
+            logger.info(
+                f"Speculative {adequate[0]} won before {self.preferred} finished "
+                "(no retrieval probe to confirm relevant context)"
+            )
+        elif answers[self.preferred].strip():
+            logger.info(
+                f"Speculative {self.preferred} answer rejected as inadequate "
+                f"(matched a no-information marker), using {adequate[0]}"
+            )
+        return adequate[0]
+
+
+async def create_orchestrator_agent(
+    rag_agent: Agent,
+    web_agent: Agent,
+    settings: Settings | None = None,
+    vector_store_manager: VectorStoreManager | None = None,
+) -> Agent:
+    """
+    Crea el agente orquestador que coordina los sub-agentes.
+
+    Args:
+        rag_agent: Agente RAG
+        web_agent: Agente Web
+        settings: Configuración del sistema (opcional)
+        vector_store_manager: Gestor de vector store, usado por el modo
+            especulativo para sondear la recuperación (opcional)
+
+    Returns:
+        Agente orquestador configurado
+    """
+    if settings is None:
+        settings = get_settings()
+
     # Crear tools para los agentes
     rag_tool = AgentTool(agent=rag_agent)
     web_tool = AgentTool(agent=web_agent)
+    tools = [rag_tool, web_tool]
+
+    if settings.orchestrator_mode == "speculative":
+        executor = SpeculativeExecutor(rag_agent, web_agent, settings, vector_store_manager)
+
+        async def ask_rag_and_web(question: str) -> dict:
+            """
+            Consulta rag_agent y web_agent en paralelo y devuelve la primera
+            respuesta adecuada. Usar cuando no está claro qué agente conviene.
+
+            Args:
+                question: Pregunta del usuario
+
+            Returns:
+                Dict con la respuesta elegida
+            """
+            return {"status": "success", "answer": await executor.run(question)}
+
+        tools.append(ask_rag_and_web)
 
-    # static_instruction=types.Content
+    system_prompt = build_orchestrator_prompt(settings.orchestrator_mode)
 
     orchestrator = Agent(
-        model=model,
+        model=get_llm_model(settings),
         name="orchestrator",
         description="Orquestador principal que coordina agentes especializados",
-        instruction=system_prompt,
-        tools=[rag_tool, web_tool],
+        static_instruction=static_instruction(system_prompt),
+        tools=tools,
+        before_model_callback=apply_load_budget,
     )
 
-    logger.info("Orchestrator Agent created successfully")
+    logger.info(f"Orchestrator Agent created successfully (mode={settings.orchestrator_mode})")
     return orchestrator
@@ -0,0 +1,72 @@
+"""Utilidades para ejecutar agentes ADK y obtener su respuesta final."""
+
+import uuid
+
+from google.adk import Runner
+from google.adk.agents import Agent
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+DEFAULT_USER_ID = "default_user"
+
+
+def create_runner(agent: Agent, app_name: str) -> Runner:
+    """
+    Crea un runner con sesiones en memoria para un agente.
+
+    Args:
+        agent: Agente a ejecutar
+        app_name: Nombre de la aplicación ADK
+
+    Returns:
+        Runner configurado
+    """
+    return Runner(app_name=app_name, agent=agent, session_service=InMemorySessionService())
+
+
+async def run_agent_query(
+    runner: Runner,
+    query: str,
+    user_id: str = DEFAULT_USER_ID,
+    session_id: str | None = None,
+) -> str:
+    """
+    Ejecuta una consulta en el runner y devuelve el texto de la respuesta final.
+
+    Si no se indica `session_id` se usa una sesión temporal que se elimina al
+    terminar, para que las consultas sueltas no acumulen sesiones en memoria.
+
+    Args:
+        runner: Runner del agente
+        query: Pregunta del usuario
+        user_id: Identificador del usuario
+        session_id: Sesión a reutilizar (opcional, se crea una nueva si no existe)
+
+    Returns:
+        Texto de la respuesta final del agente
+    """
+    ephemeral = session_id is None
+    if session_id is None:
+        session_id = uuid.uuid4().hex
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id
+    )
+    if session is None:
+        await runner.session_service.create_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+
+    message = types.Content(role="user", parts=[types.Part(text=query)])
+    response = ""
+    try:
+        async for event in runner.run_async(
+            user_id=user_id, session_id=session_id, new_message=message
+        ):
+            if event.is_final_response() and event.content and event.content.parts:
+                response = "".join(part.text or "" for part in event.content.parts)
+    finally:
+        if ephemeral:
+            await runner.session_service.delete_session(
+                app_name=runner.app_name, user_id=user_id, session_id=session_id
+            )
+    return response
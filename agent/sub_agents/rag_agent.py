@@ -1,93 +1,305 @@
 """RAG Agent con ChromaDB y Ollama."""
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
+from pathlib import Path
 
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
+from langchain_core.documents import Document
 
+from src.agent.llm import get_llm_model, static_instruction
+from src.agent.runtime import create_runner, run_agent_query
 from src.config.settings import Settings, get_settings
+from src.exceptions.exceptions import VectorStoreException
 from src.rag.vector_store import VectorStoreManager
+from src.utils.admission import apply_load_budget, current_budget, get_admission_controller
 
 logger = logging.getLogger(__name__)
 
+RAG_SYSTEM_PROMPT = """Eres un asistente especializado en responder preguntas usando información de documentos.
 
-async def create_rag_agent(
+Tu responsabilidad:
+- Buscar información relevante en la base de conocimiento
+- Responder preguntas basándote SOLO en la información encontrada
+- Citar las fuentes cuando sea apropiado
+- Admitir cuando no tienes información suficiente
+
+Cuando respondas:
+1. Usa la tool search_documents para buscar en la base de conocimiento
+2. Analiza los fragmentos obtenidos y cita su source_id
+3. Responde de forma clara y concisa
+4. Si no encuentras información, dilo claramente
+5. Si search_documents devuelve status no_relevant_context, responde solo que no hay información relevante en los documentos"""
+
+# k usado cuando el k adaptativo está desactivado y la tool no recibe k
+DEFAULT_K = 4
+
+NO_RELEVANT_CONTEXT_MESSAGE = "No hay información relevante en los documentos para esta pregunta."
+
+RETRIEVAL_ONLY_ANSWER_HEADER = (
+    "El sistema está bajo carga alta; estos son los fragmentos más relevantes de los documentos:"
+)
+
+RAG_CONTEXT_PROMPT_PREFIX = """Responde la pregunta basándote únicamente en los fragmentos de contexto que aparecen al final.
+Cita el source_id (entre corchetes) de cada fragmento que uses.
+
+"""
+
+
+def source_id(doc: Document) -> str:
+    """
+    Construye un identificador corto de la fuente de un documento.
+
+    Args:
+        doc: Documento recuperado
+
+    Returns:
+        Nombre de archivo, con página o línea si existen (p. ej. "guia.pdf#3")
+    """
+    name = Path(str(doc.metadata.get("source", "desconocido"))).name
+    for key in ("page", "line"):
+        if key in doc.metadata:
+            return f"{name}#{doc.metadata[key]}"
+    return name
+
+
+def truncate_snippet(text: str, max_chars: int) -> str:
+    """
+    Recorta un texto al límite indicado sin partir palabras.
+
+    Args:
+        text: Texto a recortar
+        max_chars: Longitud máxima
+
+    Returns:
+        Texto recortado, terminado en "…" si se truncó
+    """
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0] or text[:max_chars]
+    return f"{cut}…"
+
+
+def default_k(settings: Settings) -> int:
+    """
+    Obtiene el k usado cuando no se indica uno.
+
+    Con k adaptativo se piden rag_max_k candidatos y la distribución de
+    puntuaciones decide cuántos conservar, también por encima de 4.
+
+    Args:
+        settings: Configuración del sistema
+
+    Returns:
+        Número máximo de fragmentos a recuperar
+    """
+    return settings.rag_max_k if settings.rag_adaptive_k else DEFAULT_K
+
+
+def retrieve(
+    vector_store_manager: VectorStoreManager, query: str, k: int, settings: Settings
+) -> list[tuple[Document, float]]:
+    """
+    Recupera fragmentos con su relevancia, usando k adaptativo si está activo.
+
+    Args:
+        vector_store_manager: Gestor de vector store
+        query: Texto a buscar
+        k: Número máximo de fragmentos
+        settings: Configuración del sistema
+
+    Returns:
+        Lista de (documento, relevancia); vacía si nada supera el umbral
+
+    Raises:
+        VectorStoreException: Si hay problemas con la búsqueda
+    """
+    if settings.rag_adaptive_k:
+        return vector_store_manager.adaptive_search(query, max_k=k)
+    return vector_store_manager.similarity_search_with_scores(query, k=k)
+
+
+def create_search_tool(
     vector_store_manager: VectorStoreManager, settings: Settings | None = None
-) -> Agent:
+) -> Callable[..., Awaitable[dict]]:
     """
-    Crea un agente RAG con ChromaDB.
+    Crea la tool de búsqueda en documentos para el agente RAG.
 
     Args:
         vector_store_manager: Gestor de vector store
         settings: Configuración del sistema (opcional)
 
     Returns:
-        Agente RAG configurado
+        Función asíncrona registrable como tool de ADK
     """
     if settings is None:
         settings = get_settings()
 
-    model = LiteLlm(
-        model=f"ollama_chat/{settings.ollama_llm_model}",
-        api_base=settings.ollama_base_url,
-    )
+    async def search_documents(query: str, k: int | None = None) -> dict:
+        """
+        Busca fragmentos relevantes en la base de conocimiento.
 
-    system_prompt = """Eres un asistente especializado en responder preguntas usando información de documentos.
+        Args:
+            query: Texto a buscar
+            k: Número máximo de fragmentos a devolver (opcional; por defecto
+                se decide según la relevancia de los resultados)
 
-Tu responsabilidad:
-- Buscar información relevante en la base de conocimiento
-- Responder preguntas basándote SOLO en la información encontrada
-- Citar las fuentes cuando sea apropiado
-- Admitir cuando no tienes información suficiente
+        Returns:
+            Dict con status ("success" o "no_relevant_context") y la lista de
+            resultados (source_id, score de similitud coseno y snippet)
+        """
+        if k is None:
+            k = default_k(settings)
+        k = max(1, min(k, settings.rag_max_k, current_budget().max_k or k))
+        try:
+            with get_admission_controller().track_embedding():
+                scored = await asyncio.to_thread(
+                    retrieve, vector_store_manager, query, k, settings
+                )
+        except VectorStoreException as e:
+            return {"status": "error", "error_message": str(e)}
 
-Cuando respondas:
-1. Busca en la base de conocimiento información relevante
-2. Analiza los resultados obtenidos
-3. Responde de forma clara y concisa
-4. Si no encuentras información, dilo claramente"""
+        if not scored:
+            return {
+                "status": "no_relevant_context",
+                "message": NO_RELEVANT_CONTEXT_MESSAGE,
+                "results": [],
+            }
+
+        return {
+            "status": "success",
+            "results": [
+                {
+                    "source_id": source_id(doc),
+                    "score": round(score, 3),
+                    "snippet": truncate_snippet(doc.page_content, settings.rag_snippet_max_chars),
+                }
+                for doc, score in scored
+            ],
+        }
+
+    return search_documents
+
+
+async def create_rag_agent(
+    vector_store_manager: VectorStoreManager, settings: Settings | None = None
+) -> Agent:
+    """
+    Crea un agente RAG con ChromaDB.
+
+    Args:
+        vector_store_manager: Gestor de vector store
+        settings: Configuración del sistema (opcional)
+
+    Returns:
+        Agente RAG configurado
+    """
+    if settings is None:
+        settings = get_settings()
 
     agent = Agent(
-        model=model,
+        model=get_llm_model(settings),
         name="rag_agent",
         description="Agente especializado en búsqueda y recuperación de información",
-        instruction=system_prompt,
+        static_instruction=static_instruction(RAG_SYSTEM_PROMPT),
+        tools=[create_search_tool(vector_store_manager, settings)],
+        before_model_callback=apply_load_budget,
     )
 
     logger.info("RAG Agent created successfully")
     return agent
 
 
+def build_rag_prompt(query: str, documents: list[Document]) -> str:
+    """
+    Construye el prompt de una consulta con contexto recuperado.
+
+    El encabezado es constante para que el prefijo del prompt se repita entre
+    llamadas; la pregunta y el contexto, que cambian siempre, van al final.
+
+    Args:
+        query: Pregunta del usuario
+        documents: Documentos recuperados
+
+    Returns:
+        Prompt con prefijo estático y sufijo variable
+    """
+    context = "\n\n".join(f"[{source_id(doc)}]\n{doc.page_content}" for doc in documents)
+    return f"{RAG_CONTEXT_PROMPT_PREFIX}Pregunta del usuario: {query}\n\nContexto:\n{context}"
+
+
+async def retrieval_only_answer(
+    vector_store_manager: VectorStoreManager, query: str, settings: Settings | None = None
+) -> str:
+    """
+    Responde solo con los fragmentos recuperados, sin llamar al LLM.
+
+    Se usa como respuesta degradada cuando el sistema está bajo carga alta.
+
+    Args:
+        vector_store_manager: Gestor de vector store
+        query: Pregunta del usuario
+        settings: Configuración del sistema (opcional)
+
+    Returns:
+        Fragmentos más relevantes con su source_id
+    """
+    if settings is None:
+        settings = get_settings()
+
+    with get_admission_controller().track_embedding():
+        scored = await asyncio.to_thread(
+            retrieve, vector_store_manager, query, settings.degraded_k, settings
+        )
+    if not scored:
+        return NO_RELEVANT_CONTEXT_MESSAGE
+
+    snippets = "\n\n".join(
+        f"[{source_id(doc)}] {truncate_snippet(doc.page_content, settings.rag_snippet_max_chars)}"
+        for doc, _ in scored
+    )
+    return f"{RETRIEVAL_ONLY_ANSWER_HEADER}\n\n{snippets}"
+
+
 async def query_rag_agent(
-    agent: Agent, vector_store_manager: VectorStoreManager, query: str, k: int = 4
+    agent: Agent,
+    vector_store_manager: VectorStoreManager,
+    query: str,
+    k: int | None = None,
+    settings: Settings | None = None,
 ) -> str:
     """
     Consulta al agente RAG con contexto de documentos.
 
+    Helper para usar el agente fuera del orquestador: el flujo principal no
+    pasa por aquí, sino por la tool `search_documents`, de modo que el orden
+    de `build_rag_prompt` solo aplica a las llamadas directas.
+
     Args:
         agent: Instancia del agente RAG
         vector_store_manager: Gestor de vector store
         query: Pregunta del usuario
-        k: Número de documentos a recuperar
+        k: Número de documentos a recuperar (opcional; por defecto el mismo
+            que usa `search_documents`)
+        settings: Configuración del sistema (opcional)
 
     Returns:
         Respuesta del agente
     """
-    # Buscar documentos relevantes
-    relevant_docs = vector_store_manager.similarity_search(query, k=k)
-
-    # Construir contexto
-    context = "\n\n".join(
-        [f"Documento {i + 1}:\n{doc.page_content}" for i, doc in enumerate(relevant_docs)]
-    )
-
-    # Crear prompt con contexto
-    prompt = f"""Contexto de la base de conocimiento:
-{context}
+    if settings is None:
+        settings = get_settings()
+    if k is None:
+        k = default_k(settings)
 
-Pregunta del usuario: {query}
+    # Buscar documentos relevantes
+    scored = await asyncio.to_thread(retrieve, vector_store_manager, query, k, settings)
 
-Por favor responde basándote en el contexto proporcionado."""
+    # Sin contexto relevante no hay nada en qué basar la respuesta
+    if not scored:
+        return NO_RELEVANT_CONTEXT_MESSAGE
 
     # Ejecutar agente
-    response = await agent.run(prompt)
-    return response
+    prompt = build_rag_prompt(query, [doc for doc, _ in scored])
+    return await run_agent_query(create_runner(agent, settings.app_name), prompt)
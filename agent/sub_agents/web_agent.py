@@ -3,12 +3,27 @@
 import logging
 
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
 
+from src.agent.llm import get_llm_model, static_instruction
 from src.config.settings import Settings, get_settings
+from src.utils.admission import apply_load_budget
 
 logger = logging.getLogger(__name__)
 
+WEB_SYSTEM_PROMPT = """Eres un asistente especializado en proporcionar información general y conocimiento amplio.
+
+Tu responsabilidad:
+- Responder preguntas de conocimiento general
+- Proporcionar explicaciones claras y concisas
+- Mantener respuestas precisas y verificables
+- Reconocer cuando una pregunta está fuera de tu alcance
+
+Cuando respondas:
+1. Proporciona respuestas directas y útiles
+2. Usa ejemplos cuando sea apropiado
+3. Estructura la información de forma clara
+4. Admite cuando no estés seguro de algo"""
+
 
 async def create_web_agent(settings: Settings | None = None) -> Agent:
     """
@@ -23,30 +38,12 @@ async def create_web_agent(settings: Settings | None = None) -> Agent:
     if settings is None:
         settings = get_settings()
 
-    model = LiteLlm(
-        model=f"ollama_chat/{settings.ollama_llm_model}",
-        api_base=settings.ollama_base_url,
-    )
-
-    system_prompt = """Eres un asistente especializado en proporcionar información general y conocimiento amplio.
-
-Tu responsabilidad:
-- Responder preguntas de conocimiento general
-- Proporcionar explicaciones claras y concisas
-- Mantener respuestas precisas y verificables
-- Reconocer cuando una pregunta está fuera de tu alcance
-
-Cuando respondas:
-1. Proporciona respuestas directas y útiles
-2. Usa ejemplos cuando sea apropiado
-3. Estructura la información de forma clara
-4. Admite cuando no estés seguro de algo"""
-
     root_agent = Agent(
-        model=model,
+        model=get_llm_model(settings),
         name="web_agent",
         description="Agente especializado en conocimiento general y consultas amplias",
-        instruction=system_prompt,
+        static_instruction=static_instruction(WEB_SYSTEM_PROMPT),
+        before_model_callback=apply_load_budget,
     )
 
     logger.info("Web Agent created successfully")
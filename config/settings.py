@@ -6,7 +6,9 @@ para validación y type safety.
 """
 
 from functools import lru_cache
+from typing import Literal
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -17,19 +19,68 @@ class Settings(BaseSettings):
     ollama_base_url: str = "http://localhost:11434"
     ollama_llm_model: str = "gpt-oss:20b"
     ollama_embedding_model: str = "embeddinggemma"
+    ollama_keep_alive: str = "30m"
+    ollama_num_ctx: int = 8192
 
     # Configuración de Google ADK
     app_name: str = "multiagent-system"
 
+    # Orchestrator Configuration
+    # "delegate": el LLM elige un sub-agente; "speculative": en caso de duda
+    # consulta rag_agent y web_agent en paralelo y se queda con la primera
+    # respuesta adecuada
+    orchestrator_mode: Literal["delegate", "speculative"] = "delegate"
+
     # RAG Configuration
     documents_path: str = "src/data/documents"
     rag_enabled: bool = True
     chroma_persist_directory: str = "src/data/chroma_db"
     chroma_collection_name: str = "documents"
+    # Snapshot del índice usado para arrancar sin re-embeber el corpus
+    index_snapshot_path: str = "src/data/index_snapshot"
+    rag_max_k: int = 10
+    # k adaptativo: se piden rag_max_k candidatos, se descartan los que tienen
+    # similitud coseno bajo el umbral y se corta en el primer salto de
+    # puntuación mayor que rag_score_gap
+    rag_adaptive_k: bool = True
+    rag_relevance_threshold: float = 0.3
+    rag_score_gap: float = 0.15
+    rag_snippet_max_chars: int = 500
+    # Las queries que llegan dentro de la ventana (p. ej. en modo batch) se
+    # embeben en una sola llamada al modelo; 0 desactiva la agrupación
+    query_embedding_batch_window_seconds: float = 0.005
+    query_embedding_batch_max_size: int = 32
+    loader_max_workers: int | None = None
+    ingest_batch_size: int = 256
+    documents_watch_enabled: bool = True
+    documents_watch_poll_seconds: float = 5.0
+    documents_watch_debounce_seconds: float = 1.0
 
     # Web Search Configuration
     web_search_enabled: bool = False
 
+    # Batch Configuration
+    batch_concurrency: int = 4
+
+    # Admission Control Configuration
+    # Slots LLM = GPUs en cuda_visible_devices * admission_llm_slots_per_gpu
+    # (1 si require_gpu es False); limitan tanto las consultas en servicio
+    # como las llamadas al modelo simultáneas. Con la cola (consultas y
+    # llamadas al modelo en espera) por encima de cada umbral se
+    # reduce k y max tokens y después se responde solo con recuperación (como
+    # máximo admission_max_inflight_embeddings a la vez). Se rechaza la
+    # consulta si la cola más las respuestas solo con recuperación pendientes
+    # alcanzan admission_max_queue_depth o si la espera de un slot supera el
+    # timeout. Debe cumplirse reduced < retrieval_only < max_queue_depth
+    admission_llm_slots_per_gpu: int = 2
+    admission_max_inflight_embeddings: int = 8
+    admission_reduced_queue_depth: int = 4
+    admission_retrieval_only_queue_depth: int = 12
+    admission_max_queue_depth: int = 32
+    admission_queue_timeout_seconds: float = 60.0
+    degraded_k: int = 2
+    degraded_max_output_tokens: int = 512
+
     # Session Configuration
     session_timeout_seconds: int = 3600
 
@@ -40,6 +91,28 @@ class Settings(BaseSettings):
     require_gpu: bool = True
     cuda_visible_devices: str = "0"
 
+    @model_validator(mode="after")
+    def check_admission_thresholds(self) -> "Settings":
+        """
+        Comprueba que los umbrales de admisión estén ordenados.
+
+        Returns:
+            La configuración validada
+
+        Raises:
+            ValueError: Si los umbrales de la cola no son crecientes
+        """
+        if not (
+            self.admission_reduced_queue_depth
+            < self.admission_retrieval_only_queue_depth
+            < self.admission_max_queue_depth
+        ):
+            raise ValueError(
+                "Admission thresholds must satisfy admission_reduced_queue_depth < "
+                "admission_retrieval_only_queue_depth < admission_max_queue_depth"
+            )
+        return self
+
     class Config:
         """Pydantic configuration."""
 
@@ -85,3 +85,28 @@ class ModelNotAvailableException(AgentException):
         """
         self.message = message
         super().__init__(self.message)
+
+
+class SnapshotException(VectorStoreException):
+    """Se lanza cuando un snapshot del índice no se puede exportar o cargar."""
+
+    pass
+
+
+class OverloadedException(AgentException):
+    """
+    Se lanza cuando el sistema rechaza una consulta por exceso de carga.
+
+    Attributes:
+        message: Descripción del error con sugerencias de solución
+    """
+
+    def __init__(self, message: str) -> None:
+        """
+        Inicializa la excepción con un mensaje descriptivo.
+
+        Args:
+            message: Descripción del error
+        """
+        self.message = message
+        super().__init__(self.message)
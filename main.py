@@ -1,18 +1,31 @@
 """Entry point principal del sistema multiagente."""
 
+import argparse
 import asyncio
+import json
 import logging
 from pathlib import Path
 
 from google.adk import Runner
 from google.adk.sessions import InMemorySessionService
 
-from src.agent.orchestrator import create_orchestrator_agent
-from src.agent.sub_agents.rag_agent import create_rag_agent
-from src.agent.sub_agents.web_agent import create_web_agent
+from src.agent.orchestrator import build_orchestrator_prompt, create_orchestrator_agent
+from src.agent.runtime import run_agent_query
+from src.agent.sub_agents.rag_agent import (
+    RAG_SYSTEM_PROMPT,
+    create_rag_agent,
+    retrieval_only_answer,
+)
+from src.agent.sub_agents.web_agent import WEB_SYSTEM_PROMPT, create_web_agent
 from src.config.settings import get_settings
-from src.rag.document_loader import load_documents
+from src.exceptions.exceptions import SnapshotException
+from src.rag.document_loader import iter_documents
+from src.rag.document_watcher import start_document_watcher
+from src.rag.snapshot import MANIFEST_FILE
 from src.rag.vector_store import VectorStoreManager
+from src.utils.admission import LoadLevel, get_admission_controller, simulate_load
+from src.utils.batch import run_batch
+from src.utils.prefill_benchmark import measure_prefix_reuse
 from src.utils.system_check import validate_system_requirements
 
 logging.basicConfig(
@@ -44,19 +57,28 @@ async def initialize_system() -> tuple[Runner, VectorStoreManager]:
 
     # Verificar si ya existe vector store
     chroma_dir = Path(settings.chroma_persist_directory)
+    snapshot_manifest = Path(settings.index_snapshot_path) / MANIFEST_FILE
     if chroma_dir.exists() and any(chroma_dir.iterdir()):
         logger.info("Cargando vector store existente...")
         vector_store_manager.load_existing()
+    elif snapshot_manifest.exists():
+        logger.info("Cargando vector store desde snapshot...")
+        try:
+            vector_store_manager.load_snapshot(settings.index_snapshot_path)
+        except SnapshotException as e:
+            logger.warning(f"Snapshot rechazado, indexando los documentos: {e}")
+            vector_store_manager.initialize(iter_documents(settings))
     else:
         logger.info("Creando nuevo vector store...")
-        documents = load_documents(settings)
-        vector_store_manager.initialize(documents)
+        vector_store_manager.initialize(iter_documents(settings))
 
     # 4. Crear agentes
     logger.info("Creando agentes...")
     rag_agent = await create_rag_agent(vector_store_manager, settings)
     web_agent = await create_web_agent(settings)
-    orchestrator = await create_orchestrator_agent(rag_agent, web_agent, settings)
+    orchestrator = await create_orchestrator_agent(
+        rag_agent, web_agent, settings, vector_store_manager
+    )
 
     # 5. Crear runner
     session_service = InMemorySessionService()
@@ -70,12 +92,37 @@ async def initialize_system() -> tuple[Runner, VectorStoreManager]:
     return runner, vector_store_manager
 
 
-async def run_interactive_mode(runner: Runner) -> None:
+async def answer_query(
+    runner: Runner, vector_store_manager: VectorStoreManager, query: str
+) -> tuple[str, LoadLevel]:
+    """
+    Responde una consulta pasando por el control de admisión.
+
+    Args:
+        runner: Runner del agente orquestador
+        vector_store_manager: Gestor de vector store
+        query: Pregunta del usuario
+
+    Returns:
+        Tupla con la respuesta (completa, o solo con recuperación si hay
+        carga alta) y el nivel de servicio aplicado
+
+    Raises:
+        OverloadedException: Si el sistema está saturado
+    """
+    return await get_admission_controller().submit(
+        lambda: run_agent_query(runner, query),
+        lambda: retrieval_only_answer(vector_store_manager, query),
+    )
+
+
+async def run_interactive_mode(runner: Runner, vector_store_manager: VectorStoreManager) -> None:
     """
     Ejecuta el sistema en modo interactivo.
 
     Args:
         runner: Runner del agente orquestador
+        vector_store_manager: Gestor de vector store
     """
     print("\n" + "=" * 60)
     print("Sistema Multiagente con Google ADK + Ollama")
@@ -99,8 +146,10 @@ async def run_interactive_mode(runner: Runner) -> None:
 
             # Ejecutar query
             print("\nOrquestador: Procesando...\n")
-            response = await runner.run(user_input)
-            print(f"Respuesta: {response.text}\n")
+            response, level = await answer_query(runner, vector_store_manager, user_input)
+            if level is not LoadLevel.NORMAL:
+                print(f"(Respuesta degradada por carga: {level.value})")
+            print(f"Respuesta: {response}\n")
             print("-" * 60 + "\n")
 
         except KeyboardInterrupt:
@@ -111,19 +160,183 @@ async def run_interactive_mode(runner: Runner) -> None:
             print(f"\nError: {e}\n")
 
 
-async def main() -> None:
-    """Función principal."""
+async def run_batch_mode(
+    runner: Runner,
+    vector_store_manager: VectorStoreManager,
+    input_path: Path,
+    output_path: Path,
+    concurrency: int,
+) -> None:
+    """
+    Ejecuta el sistema en modo batch sobre un archivo JSONL de preguntas.
+
+    Args:
+        runner: Runner del agente orquestador
+        vector_store_manager: Gestor de vector store
+        input_path: Archivo JSONL de preguntas
+        output_path: Archivo JSONL de resultados
+        concurrency: Máximo de consultas simultáneas
+    """
+    summary = await run_batch(
+        lambda query: answer_query(runner, vector_store_manager, query),
+        input_path,
+        output_path,
+        concurrency,
+    )
+
+    print("\n" + "=" * 60)
+    print("Resumen del modo batch")
+    print("=" * 60)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    print(f"Resultados en: {output_path}")
+
+
+def run_prefill_measurement() -> None:
+    """Mide el prefill ahorrado al reutilizar los system prompts estáticos."""
+    settings = get_settings()
+    prompts = {
+        "orchestrator": build_orchestrator_prompt(settings.orchestrator_mode),
+        "rag_agent": RAG_SYSTEM_PROMPT,
+        "web_agent": WEB_SYSTEM_PROMPT,
+    }
+    results = measure_prefix_reuse(settings, prompts)
+
+    print("\n" + "=" * 60)
+    print("Reutilización del prefijo del prompt (prefill)")
+    print("=" * 60)
+    for result in results:
+        print(
+            f"{result['prompt']:<14} frío: {result['cold_prompt_tokens']} tokens "
+            f"{result['cold_prefill_ms']} ms | repetido: {result['repeated_prompt_tokens']} "
+            f"tokens {result['repeated_prefill_ms']} ms | alterno: "
+            f"{result['interleaved_prompt_tokens']} tokens {result['interleaved_prefill_ms']} ms"
+            f" | ahorro: {result['saved_ms']} ms ({result['saved_pct']}%)"
+        )
+    print(
+        "\nEl ahorro se mide con la secuencia alterna (orquestador y sub-agentes "
+        "turnándose en el mismo modelo); 'repetido' es el mejor caso."
+    )
+
+
+async def run_load_simulation(requests: int) -> None:
+    """
+    Simula una ráfaga contra un backend lento para ajustar la admisión.
+
+    Args:
+        requests: Número de consultas de la ráfaga
+    """
+    summary = await simulate_load(get_admission_controller(), requests)
+
+    print("\n" + "=" * 60)
+    print("Simulación de carga (backend lento)")
+    print("=" * 60)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parsea los argumentos de línea de comandos.
+
+    Returns:
+        Argumentos parseados
+    """
+    parser = argparse.ArgumentParser(description="Sistema multiagente con Google ADK + Ollama")
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        metavar="INPUT.jsonl",
+        help="Responde las preguntas de un archivo JSONL en lugar del modo interactivo",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        metavar="OUTPUT.jsonl",
+        help="Archivo de resultados del modo batch (por defecto <INPUT>.answers.jsonl)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Consultas simultáneas en modo batch (por defecto BATCH_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--export-snapshot",
+        type=Path,
+        nargs="?",
+        const=Path(get_settings().index_snapshot_path),
+        metavar="DIR",
+        help="Exporta el índice a un snapshot (por defecto INDEX_SNAPSHOT_PATH) y termina",
+    )
+    parser.add_argument(
+        "--simulate-load",
+        type=int,
+        metavar="N",
+        help="Simula N consultas contra un backend lento para probar la admisión y termina",
+    )
+    parser.add_argument(
+        "--measure-prefill",
+        action="store_true",
+        help="Mide el prefill ahorrado al reutilizar los system prompts y termina",
+    )
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace | None = None) -> None:
+    """
+    Función principal.
+
+    Args:
+        args: Argumentos de línea de comandos (opcional)
+    """
+    if args is None:
+        args = argparse.Namespace(
+            batch=None,
+            output=None,
+            concurrency=None,
+            export_snapshot=None,
+            simulate_load=None,
+            measure_prefill=False,
+        )
+
+    if args.measure_prefill:
+        run_prefill_measurement()
+        return
+
+    if args.simulate_load is not None:
+        await run_load_simulation(args.simulate_load)
+        return
+
+    watcher = None
     try:
         # Inicializar sistema
         runner, vector_store_manager = await initialize_system()
 
-        # Ejecutar en modo interactivo
-        await run_interactive_mode(runner)
+        if args.export_snapshot is not None:
+            manifest = vector_store_manager.export_snapshot(args.export_snapshot)
+            print(f"Snapshot exportado en {args.export_snapshot} ({manifest['count']} chunks)")
+            return
+
+        # Mantener el índice sincronizado con documents_path
+        watcher = start_document_watcher(vector_store_manager)
+
+        if args.batch is not None:
+            # Ejecutar en modo batch
+            settings = get_settings()
+            output_path = args.output or args.batch.with_suffix(".answers.jsonl")
+            concurrency = args.concurrency or settings.batch_concurrency
+            await run_batch_mode(
+                runner, vector_store_manager, args.batch, output_path, concurrency
+            )
+        else:
+            # Ejecutar en modo interactivo
+            await run_interactive_mode(runner, vector_store_manager)
 
     except Exception as e:
         logger.error(f"Error fatal: {e}", exc_info=True)
         raise
+    finally:
+        if watcher is not None:
+            watcher.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(parse_args()))
@@ -1,9 +1,15 @@
 """Cargador de documentos para RAG."""
 
+import json
 import logging
+import os
+import re
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from html.parser import HTMLParser
 from pathlib import Path
 
-from langchain_community.document_loaders import TextLoader
 from langchain_core.documents import Document
 
 from src.config.settings import Settings, get_settings
@@ -11,6 +17,182 @@ from src.exceptions.exceptions import DocumentLoaderException
 
 logger = logging.getLogger(__name__)
 
+_JSONL_TEXT_FIELDS = ("text", "content", "page_content", "body")
+
+
+@dataclass(frozen=True)
+class FormatLoader:
+    """
+    Loader registrado para una extensión de archivo.
+
+    Attributes:
+        parse: Función que convierte un archivo en documentos
+        normalize: Normalización de texto aplicada a cada documento
+        cpu_bound: Si el parseo es costoso y debe ir al pool de procesos
+    """
+
+    parse: Callable[[Path], list[Document]]
+    normalize: Callable[[str], str]
+    cpu_bound: bool = False
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Elimina espacios finales de línea y colapsa líneas en blanco consecutivas.
+
+    La sangría se conserva: los documentos pueden incluir código.
+
+    Args:
+        text: Texto a normalizar
+
+    Returns:
+        Texto normalizado
+    """
+    text = re.sub(r"[ \t\f\v]+$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip("\n")
+
+
+def normalize_markdown(text: str) -> str:
+    """
+    Elimina la sintaxis Markdown conservando el texto legible.
+
+    Args:
+        text: Texto Markdown
+
+    Returns:
+        Texto plano normalizado
+    """
+    text = re.sub(r"\A---\n.*?\n---\n", "", text, flags=re.DOTALL)
+    text = re.sub(r"^```.*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"!\[([^\]]*)\]\([^)]*\)", r"\1", text)
+    text = re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", text)
+    text = re.sub(r"^[ \t]{0,3}(#{1,6}|>|[-*+]|\d+\.)[ \t]+", "", text, flags=re.MULTILINE)
+    text = re.sub(r"(\*\*|\*|`)(\S.*?\S|\S)\1", r"\2", text)
+    text = re.sub(r"(?<!\w)(__|_)(\S.*?\S|\S)\1(?!\w)", r"\2", text)
+    return normalize_whitespace(text)
+
+
+def _read_text(file_path: Path) -> str:
+    """Lee un archivo de texto en UTF-8."""
+    return file_path.read_text(encoding="utf-8")
+
+
+def _parse_text(file_path: Path) -> list[Document]:
+    """Parsea un archivo de texto plano o Markdown como un único documento."""
+    return [Document(page_content=_read_text(file_path), metadata={"source": str(file_path)})]
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Extrae el texto visible y el título de un documento HTML."""
+
+    _SKIP_TAGS = {"script", "style", "noscript", "template"}
+    _BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.title = ""
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:  # noqa: ARG002
+        if tag in self._SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self.title += data
+        else:
+            self.parts.append(data)
+
+
+def _parse_html(file_path: Path) -> list[Document]:
+    """Parsea un archivo HTML extrayendo el texto visible."""
+    extractor = _HTMLTextExtractor()
+    extractor.feed(_read_text(file_path))
+    extractor.close()
+
+    metadata = {"source": str(file_path)}
+    if extractor.title.strip():
+        metadata["title"] = extractor.title.strip()
+    return [Document(page_content="".join(extractor.parts), metadata=metadata)]
+
+
+def _parse_pdf(file_path: Path) -> list[Document]:
+    """Parsea un PDF generando un documento por página."""
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise DocumentLoaderException(
+            f"pypdf is required to load PDF files ({file_path}). Install with: uv add pypdf"
+        ) from e
+
+    reader = PdfReader(str(file_path))
+    return [
+        Document(
+            page_content=page.extract_text() or "",
+            metadata={"source": str(file_path), "page": page_number},
+        )
+        for page_number, page in enumerate(reader.pages)
+    ]
+
+
+def _parse_jsonl(file_path: Path) -> list[Document]:
+    """Parsea un export JSONL generando un documento por línea."""
+    documents: list[Document] = []
+    with file_path.open(encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping malformed line {line_number} in {file_path}: {e}")
+                continue
+            if not isinstance(record, dict):
+                continue
+
+            text = next((record[k] for k in _JSONL_TEXT_FIELDS if record.get(k)), None)
+            if not isinstance(text, str):
+                continue
+
+            metadata = {
+                key: value
+                for key, value in record.items()
+                if key not in _JSONL_TEXT_FIELDS and isinstance(value, (str, int, float, bool))
+            }
+            metadata["source"] = str(file_path)
+            metadata["line"] = line_number
+            documents.append(Document(page_content=text, metadata=metadata))
+    return documents
+
+
+LOADERS: dict[str, FormatLoader] = {
+    ".txt": FormatLoader(parse=_parse_text, normalize=normalize_whitespace),
+    ".md": FormatLoader(parse=_parse_text, normalize=normalize_markdown),
+    ".markdown": FormatLoader(parse=_parse_text, normalize=normalize_markdown),
+    ".html": FormatLoader(parse=_parse_html, normalize=normalize_whitespace, cpu_bound=True),
+    ".htm": FormatLoader(parse=_parse_html, normalize=normalize_whitespace, cpu_bound=True),
+    ".pdf": FormatLoader(parse=_parse_pdf, normalize=normalize_whitespace, cpu_bound=True),
+    ".jsonl": FormatLoader(parse=_parse_jsonl, normalize=normalize_whitespace),
+}
+
 
 def load_documents(settings: Settings | None = None) -> list[Document]:
     """
@@ -22,6 +204,28 @@ def load_documents(settings: Settings | None = None) -> list[Document]:
     Returns:
         Lista de documentos cargados
 
+    Raises:
+        DocumentLoaderException: Si hay problemas cargando documentos
+    """
+    documents = list(iter_documents(settings))
+    logger.info(f"Total documents loaded: {len(documents)}")
+    return documents
+
+
+def iter_documents(settings: Settings | None = None) -> Iterator[Document]:
+    """
+    Carga documentos en streaming desde el directorio configurado.
+
+    Los formatos ligeros se parsean en el proceso actual mientras los
+    formatos costosos (HTML, PDF) se reparten en un pool de procesos; los
+    documentos se entregan a medida que cada archivo termina.
+
+    Args:
+        settings: Configuración del sistema (opcional)
+
+    Yields:
+        Documentos cargados
+
     Raises:
         DocumentLoaderException: Si hay problemas cargando documentos
     """
@@ -36,22 +240,81 @@ def load_documents(settings: Settings | None = None) -> list[Document]:
     if not documents_path.is_dir():
         raise DocumentLoaderException(f"Documents path is not a directory: {documents_path}")
 
-    documents: list[Document] = []
-    text_files = list(documents_path.glob("**/*.txt"))
+    files = list_document_files(documents_path)
+
+    if not files:
+        logger.warning(f"No supported files found in {documents_path}")
+        return
+
+    heavy_files = [f for f in files if LOADERS[f.suffix.lower()].cpu_bound]
+    light_files = [f for f in files if not LOADERS[f.suffix.lower()].cpu_bound]
+
+    if len(heavy_files) < 2:
+        light_files, heavy_files = files, []
 
-    if not text_files:
-        logger.warning(f"No .txt files found in {documents_path}")
-        return documents
+    max_workers = min(settings.loader_max_workers or os.cpu_count() or 1, len(heavy_files) or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(load_file, f): f for f in heavy_files}
 
-    for file_path in text_files:
-        try:
-            loader = TextLoader(str(file_path), encoding="utf-8")
-            file_docs = loader.load()
-            documents.extend(file_docs)
+        for file_path in light_files:
+            file_docs = load_file(file_path)
             logger.info(f"Loaded {len(file_docs)} documents from {file_path.name}")
-        except Exception as e:
-            logger.error(f"Error loading {file_path}: {e}")
-            raise DocumentLoaderException(f"Failed to load document {file_path}: {e}") from e
+            yield from file_docs
 
-    logger.info(f"Total documents loaded: {len(documents)}")
+        for future in as_completed(futures):
+            file_docs = future.result()
+            logger.info(f"Loaded {len(file_docs)} documents from {futures[future].name}")
+            yield from file_docs
+
+
+def list_document_files(documents_path: Path) -> list[Path]:
+    """
+    Lista los archivos soportados dentro del directorio de documentos.
+
+    Args:
+        documents_path: Directorio raíz de documentos
+
+    Returns:
+        Lista de rutas de archivos con un loader registrado
+    """
+    return sorted(
+        path
+        for path in documents_path.rglob("*")
+        if path.suffix.lower() in LOADERS and path.is_file()
+    )
+
+
+def load_file(file_path: Path) -> list[Document]:
+    """
+    Carga un único archivo de documentos usando el loader de su extensión.
+
+    Args:
+        file_path: Ruta del archivo a cargar
+
+    Returns:
+        Lista de documentos del archivo
+
+    Raises:
+        DocumentLoaderException: Si hay problemas cargando el archivo
+    """
+    loader = LOADERS.get(file_path.suffix.lower())
+    if loader is None:
+        raise DocumentLoaderException(f"Unsupported document format: {file_path}")
+
+    try:
+        file_docs = loader.parse(file_path)
+        mtime = file_path.stat().st_mtime
+    except DocumentLoaderException:
+        raise
+    except Exception as e:
+        logger.error(f"Error loading {file_path}: {e}")
+        raise DocumentLoaderException(f"Failed to load document {file_path}: {e}") from e
+
+    documents: list[Document] = []
+    for doc in file_docs:
+        doc.page_content = loader.normalize(doc.page_content)
+        if not doc.page_content:
+            continue
+        doc.metadata["mtime"] = mtime
+        documents.append(doc)
     return documents
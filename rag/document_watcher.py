@@ -0,0 +1,244 @@
+"""Observador de documentos para actualizar el vector store en caliente."""
+
+import logging
+import threading
+from pathlib import Path
+
+from src.config.settings import Settings, get_settings
+from src.exceptions.exceptions import AgentException
+from src.rag.document_loader import list_document_files, load_file
+from src.rag.snapshot import source_content_hash
+from src.rag.vector_store import VectorStoreManager
+from src.utils.admission import get_admission_controller
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - watchdog es opcional
+    FileSystemEventHandler = None
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentWatcher:
+    """
+    Observa `documents_path` y sincroniza los cambios con el vector store.
+
+    Usa eventos del sistema de archivos (inotify vía watchdog) cuando están
+    disponibles y, en cualquier caso, un sondeo periódico como respaldo. Las
+    ráfagas de cambios se agrupan esperando a que el directorio se estabilice
+    antes de aplicar upserts y borrados.
+
+    Los documentos sin cambios de contenido no se vuelven a embeber: un
+    archivo nuevo cuyo contenido coincide con una fuente indexada que ya no
+    existe (p. ej. un índice cargado de un snapshot exportado en otro nodo,
+    con otras rutas) se trata como un movimiento y reutiliza sus vectores.
+    """
+
+    def __init__(
+        self, vector_store_manager: VectorStoreManager, settings: Settings | None = None
+    ) -> None:
+        """
+        Inicializa el observador.
+
+        Args:
+            vector_store_manager: Gestor de vector store a actualizar
+            settings: Configuración del sistema (opcional)
+        """
+        self.settings = settings or get_settings()
+        self.vector_store_manager = vector_store_manager
+        self.documents_path = Path(self.settings.documents_path)
+        self._known: dict[str, float | None] = {}
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._observer = None
+        self._missing_warned = False
+
+    def start(self) -> None:
+        """Inicia el observador en un hilo en segundo plano."""
+        if self._thread is not None:
+            return
+
+        self._known = self.vector_store_manager.indexed_sources()
+        self._start_observer()
+        self._thread = threading.Thread(
+            target=self._run, name="document-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching {self.documents_path} for document changes")
+
+    def stop(self) -> None:
+        """Detiene el observador y espera a que termine el hilo."""
+        self._stopped.set()
+        self._changed.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _start_observer(self) -> None:
+        """Registra el observador de eventos del sistema de archivos si existe."""
+        if Observer is None:
+            logger.info("watchdog not installed, falling back to polling")
+            return
+        if not self.documents_path.is_dir():
+            logger.warning(f"{self.documents_path} does not exist, falling back to polling")
+            return
+
+        changed = self._changed
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event) -> None:  # noqa: ANN001
+                changed.set()
+
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), str(self.documents_path), recursive=True)
+        self._observer.start()
+
+    def _run(self) -> None:
+        """Bucle principal: reconcilia al inicio y después ante cada cambio."""
+        self.sync()
+        while not self._stopped.is_set():
+            self._changed.wait(timeout=self.settings.documents_watch_poll_seconds)
+            self._changed.clear()
+            if self._stopped.is_set():
+                break
+            self.sync()
+
+    def _scan(self) -> dict[str, float] | None:
+        """
+        Obtiene el estado actual del directorio de documentos.
+
+        Returns:
+            Dict con fuente -> mtime de cada archivo soportado, o None si el
+            directorio no existe (p. ej. ruta errónea o volumen sin montar)
+        """
+        if not self.documents_path.is_dir():
+            return None
+
+        snapshot: dict[str, float] = {}
+        for file_path in list_document_files(self.documents_path):
+            try:
+                snapshot[str(file_path)] = file_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+        return snapshot
+
+    def _wait_until_stable(self, current: dict[str, float]) -> dict[str, float] | None:
+        """
+        Espera a que el directorio deje de cambiar (debounce).
+
+        Args:
+            current: Último estado observado
+
+        Returns:
+            Estado estable del directorio, o None si dejó de existir
+        """
+        while not self._stopped.wait(self.settings.documents_watch_debounce_seconds):
+            self._changed.clear()
+            latest = self._scan()
+            if latest is None or latest == current:
+                return latest
+            current = latest
+        return current
+
+    def _vanished_by_hash(self, current: dict[str, float]) -> dict[str, str]:
+        """
+        Obtiene el hash de contenido de las fuentes indexadas que ya no existen.
+
+        Args:
+            current: Estado actual del directorio
+
+        Returns:
+            Dict con hash de contenido -> fuente indexada desaparecida; vacío
+            si no hay archivos nuevos con los que emparejarlas
+        """
+        vanished = set(self._known) - set(current)
+        if not vanished or not set(current) - set(self._known):
+            return {}
+        try:
+            hashes = self.vector_store_manager.source_hashes(vanished)
+        except AgentException as e:
+            logger.warning(f"Could not read indexed source hashes, re-embedding instead: {e}")
+            return {}
+        return {content_hash: source for source, content_hash in hashes.items()}
+
+    def sync(self) -> None:
+        """
+        Aplica al vector store las diferencias con el estado indexado.
+
+        Si `documents_path` no existe no se reconcilia nada: un directorio
+        ausente no significa que se hayan borrado todos los documentos.
+        """
+        current = self._scan()
+        if current is None:
+            if not self._missing_warned:
+                logger.warning(
+                    f"{self.documents_path} does not exist, skipping reconciliation "
+                    "to keep the indexed documents"
+                )
+                self._missing_warned = True
+            return
+        self._missing_warned = False
+        if current == self._known:
+            return
+
+        current = self._wait_until_stable(current)
+        if current is None:
+            return
+
+        moved_from = self._vanished_by_hash(current)
+        for source, mtime in current.items():
+            if source in self._known and self._known[source] == mtime:
+                continue
+            try:
+                documents = load_file(Path(source))
+                previous = None
+                if source not in self._known and moved_from:
+                    content_hash = source_content_hash(doc.page_content for doc in documents)
+                    previous = moved_from.pop(content_hash, None)
+                # Los re-embeddings compiten con las consultas por Ollama
+                with get_admission_controller().track_embedding():
+                    self.vector_store_manager.upsert_source(source, documents, previous)
+                self._known[source] = mtime
+                if previous is not None:
+                    logger.info(f"{source} matches indexed {previous}, reusing its embeddings")
+                    self._known.pop(previous, None)
+            except AgentException as e:
+                logger.error(f"Error indexing {source}, will retry: {e}")
+
+        for source in set(self._known) - set(current):
+            try:
+                self.vector_store_manager.delete_source(source)
+                del self._known[source]
+            except AgentException as e:
+                logger.error(f"Error removing {source}, will retry: {e}")
+
+
+def start_document_watcher(
+    vector_store_manager: VectorStoreManager, settings: Settings | None = None
+) -> DocumentWatcher | None:
+    """
+    Crea e inicia el observador de documentos si está habilitado.
+
+    Args:
+        vector_store_manager: Gestor de vector store a actualizar
+        settings: Configuración del sistema (opcional)
+
+    Returns:
+        Observador en ejecución, o None si está deshabilitado
+    """
+    if settings is None:
+        settings = get_settings()
+
+    if not settings.documents_watch_enabled:
+        return None
+
+    watcher = DocumentWatcher(vector_store_manager, settings)
+    watcher.start()
+    return watcher
@@ -1,5 +1,10 @@
 """Configuración de embeddings con Ollama."""
 
+import threading
+import time
+from concurrent.futures import Future
+
+from langchain_core.embeddings import Embeddings
 from langchain_ollama import OllamaEmbeddings
 
 from src.config.settings import Settings, get_settings
@@ -22,3 +27,74 @@ def get_embeddings(settings: Settings | None = None) -> OllamaEmbeddings:
         model=settings.ollama_embedding_model,
         base_url=settings.ollama_base_url,
     )
+
+
+class QueryEmbeddingBatcher:
+    """
+    Agrupa llamadas concurrentes a `embed_query` en una sola `embed_documents`.
+
+    El primer hilo que encola una query espera `window_seconds` y envía juntas
+    todas las queries que llegaron mientras tanto (o antes, si se alcanza
+    `max_batch_size`). Queries idénticas en la misma ventana comparten
+    embedding. Con ventana 0 cada query se embebe por separado.
+    """
+
+    def __init__(self, embeddings: Embeddings, window_seconds: float, max_batch_size: int) -> None:
+        """
+        Inicializa el agrupador.
+
+        Args:
+            embeddings: Modelo de embeddings
+            window_seconds: Tiempo que se espera a otras queries antes de enviar
+            max_batch_size: Máximo de queries por llamada al modelo
+        """
+        self.embeddings = embeddings
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def embed_query(self, query: str) -> list[float]:
+        """
+        Obtiene el embedding de una query, agrupándola con las concurrentes.
+
+        Args:
+            query: Texto de la query
+
+        Returns:
+            Embedding de la query
+        """
+        if self.window_seconds <= 0:
+            return self.embeddings.embed_query(query)
+
+        with self._lock:
+            future = self._pending.get(query)
+            leader = future is None and not self._pending
+            if future is None:
+                future = Future()
+                self._pending[query] = future
+            full = len(self._pending) >= self.max_batch_size
+
+        if full:
+            self._flush()
+        elif leader:
+            time.sleep(self.window_seconds)
+            self._flush()
+        return future.result()
+
+    def _flush(self) -> None:
+        """Embebe en una sola llamada todas las queries pendientes."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        queries = list(batch)
+        try:
+            vectors = self.embeddings.embed_documents(queries)
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for query, vector in zip(queries, vectors, strict=True):
+            batch[query].set_result(vector)
@@ -0,0 +1,236 @@
+"""
+Snapshots versionados del índice vectorial.
+
+Un snapshot es un directorio autocontenido que permite arrancar un nodo nuevo
+sin volver a embeber el corpus:
+
+- `manifest.json`: versión del formato, modelo de embeddings, dimensiones,
+  sha256 de cada archivo y hash de contenido por fuente
+- `vectors.npy`: matriz float32 de embeddings, sin comprimir para poder
+  cargarla con memory-mapping
+- `records.jsonl.gz`: ids, textos y metadatos de cada chunk, comprimidos
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import shutil
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+from src.config.settings import Settings
+from src.exceptions.exceptions import SnapshotException
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+RECORDS_FILE = "records.jsonl.gz"
+
+
+def _file_sha256(path: Path) -> str:
+    """Calcula el sha256 de un archivo leyendo por bloques."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_content_hash(texts: Iterable[str]) -> str:
+    """
+    Calcula el hash de contenido de una fuente a partir de sus chunks.
+
+    No depende de la ruta ni del orden de los chunks, de modo que permite
+    reconocer el mismo documento indexado en otro nodo o con otra ruta.
+
+    Args:
+        texts: Textos de los chunks de la fuente
+
+    Returns:
+        sha256 hexadecimal del contenido
+    """
+    return hashlib.sha256("\0".join(sorted(texts)).encode("utf-8")).hexdigest()
+
+
+def _source_hashes(documents: list[str], metadatas: list[dict]) -> dict[str, str]:
+    """Calcula un hash de contenido por fuente a partir de sus chunks."""
+    chunks: dict[str, list[str]] = {}
+    for text, metadata in zip(documents, metadatas, strict=True):
+        source = str((metadata or {}).get("source", "unknown"))
+        chunks.setdefault(source, []).append(text)
+
+    return {source: source_content_hash(texts) for source, texts in sorted(chunks.items())}
+
+
+def write_snapshot(records: dict, settings: Settings, path: Path) -> dict:
+    """
+    Exporta a un snapshot el contenido leído del vector store.
+
+    El snapshot se escribe en un directorio temporal y se mueve a `path` al
+    terminar, de modo que nunca queda un snapshot a medio escribir.
+
+    Args:
+        records: Resultado de `Chroma.get` con embeddings, documentos y metadatos
+        settings: Configuración del sistema
+        path: Directorio destino del snapshot
+
+    Returns:
+        Manifest del snapshot escrito
+
+    Raises:
+        SnapshotException: Si hay problemas exportando
+    """
+    ids = list(records.get("ids") or [])
+    if not ids:
+        raise SnapshotException("Vector store is empty, nothing to snapshot")
+
+    documents = list(records["documents"])
+    metadatas = [metadata or {} for metadata in records["metadatas"]]
+    vectors = np.asarray(records["embeddings"], dtype=np.float32)
+
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+
+        np.save(tmp_path / VECTORS_FILE, vectors)
+        with gzip.open(tmp_path / RECORDS_FILE, "wt", encoding="utf-8") as f:
+            for record_id, text, metadata in zip(ids, documents, metadatas, strict=True):
+                f.write(json.dumps({"id": record_id, "document": text, "metadata": metadata}))
+                f.write("\n")
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "embedding_model": settings.ollama_embedding_model,
+            "collection_name": settings.chroma_collection_name,
+            "count": len(ids),
+            "dimension": int(vectors.shape[1]),
+            "files": {
+                name: _file_sha256(tmp_path / name) for name in (VECTORS_FILE, RECORDS_FILE)
+            },
+            "sources": _source_hashes(documents, metadatas),
+        }
+        (tmp_path / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+        shutil.rmtree(path, ignore_errors=True)
+        tmp_path.rename(path)
+    except OSError as e:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise SnapshotException(f"Failed to write snapshot to {path}: {e}") from e
+
+    logger.info(f"Snapshot exported to {path} ({len(ids)} chunks)")
+    return manifest
+
+
+def read_manifest(path: Path) -> dict:
+    """
+    Lee el manifest de un snapshot.
+
+    Args:
+        path: Directorio del snapshot
+
+    Returns:
+        Manifest del snapshot
+
+    Raises:
+        SnapshotException: Si el manifest no existe o no es válido
+    """
+    manifest_path = path / MANIFEST_FILE
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except FileNotFoundError as e:
+        raise SnapshotException(f"Snapshot manifest not found: {manifest_path}") from e
+    except json.JSONDecodeError as e:
+        raise SnapshotException(f"Invalid snapshot manifest {manifest_path}: {e}") from e
+
+
+def verify_snapshot(path: Path, settings: Settings) -> dict:
+    """
+    Comprueba versión, modelo de embeddings e integridad de un snapshot.
+
+    Args:
+        path: Directorio del snapshot
+        settings: Configuración del sistema
+
+    Returns:
+        Manifest verificado
+
+    Raises:
+        SnapshotException: Si el snapshot es incompatible o está corrupto
+    """
+    manifest = read_manifest(path)
+
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotException(
+            f"Unsupported snapshot format version {manifest.get('format_version')} "
+            f"(expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+
+    if manifest.get("embedding_model") != settings.ollama_embedding_model:
+        raise SnapshotException(
+            f"Snapshot was built with embedding model '{manifest.get('embedding_model')}' "
+            f"but '{settings.ollama_embedding_model}' is configured"
+        )
+
+    for name, expected in manifest.get("files", {}).items():
+        file_path = path / name
+        if not file_path.is_file():
+            raise SnapshotException(f"Snapshot file missing: {file_path}")
+        if _file_sha256(file_path) != expected:
+            raise SnapshotException(f"Snapshot file corrupted (sha256 mismatch): {file_path}")
+
+    return manifest
+
+
+def iter_snapshot_batches(
+    path: Path, batch_size: int
+) -> Iterator[tuple[list[str], np.ndarray, list[str], list[dict | None]]]:
+    """
+    Lee un snapshot verificado en lotes listos para insertar en Chroma.
+
+    Los vectores se abren con memory-mapping, por lo que solo se copian a
+    memoria los lotes que se están insertando.
+
+    Args:
+        path: Directorio del snapshot
+        batch_size: Número de chunks por lote
+
+    Yields:
+        Tuplas (ids, embeddings, documentos, metadatos)
+
+    Raises:
+        SnapshotException: Si el contenido no coincide con el manifest
+    """
+    vectors = np.load(path / VECTORS_FILE, mmap_mode="r")
+    offset = 0
+    ids: list[str] = []
+    documents: list[str] = []
+    metadatas: list[dict | None] = []
+
+    with gzip.open(path / RECORDS_FILE, "rt", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            ids.append(record["id"])
+            documents.append(record["document"])
+            # Chroma no acepta metadatos vacíos
+            metadatas.append(record["metadata"] or None)
+            if len(ids) == batch_size:
+                yield ids, np.asarray(vectors[offset : offset + len(ids)]), documents, metadatas
+                offset += len(ids)
+                ids, documents, metadatas = [], [], []
+
+    if ids:
+        yield ids, np.asarray(vectors[offset : offset + len(ids)]), documents, metadatas
+        offset += len(ids)
+
+    if offset != vectors.shape[0]:
+        raise SnapshotException(
+            f"Snapshot records ({offset}) do not match vectors ({vectors.shape[0]})"
+        )
@@ -1,6 +1,10 @@
 """Gestión de vector store con ChromaDB."""
 
 import logging
+import shutil
+import threading
+from collections.abc import Iterable
+from itertools import chain, islice
 from pathlib import Path
 
 from langchain_chroma import Chroma
@@ -8,8 +12,18 @@ from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 
 from src.config.settings import Settings, get_settings
-from src.exceptions.exceptions import VectorStoreException
-from src.rag.embeddings import get_embeddings
+from src.exceptions.exceptions import (
+    DocumentLoaderException,
+    SnapshotException,
+    VectorStoreException,
+)
+from src.rag.embeddings import QueryEmbeddingBatcher, get_embeddings
+from src.rag.snapshot import (
+    iter_snapshot_batches,
+    source_content_hash,
+    verify_snapshot,
+    write_snapshot,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,31 +44,59 @@ class VectorStoreManager:
         self.settings = settings or get_settings()
         self.embeddings = embeddings or get_embeddings(self.settings)
         self.vector_store: Chroma | None = None
+        # Serializa escrituras frente a lecturas para que las búsquedas vean
+        # siempre un snapshot consistente de cada fuente
+        self._lock = threading.RLock()
+        self._query_batcher = QueryEmbeddingBatcher(
+            self.embeddings,
+            self.settings.query_embedding_batch_window_seconds,
+            self.settings.query_embedding_batch_max_size,
+        )
 
-    def initialize(self, documents: list[Document]) -> None:
+    def initialize(self, documents: Iterable[Document]) -> None:
         """
         Inicializa el vector store con documentos.
 
+        Los documentos se consumen en lotes de `ingest_batch_size`, por lo que
+        se puede pasar directamente el iterador de `iter_documents` y embeber
+        mientras el resto del corpus se sigue parseando.
+
         Args:
-            documents: Lista de documentos a indexar
+            documents: Documentos a indexar (lista o iterador)
 
         Raises:
             VectorStoreException: Si hay problemas inicializando
         """
-        if not documents:
+        batch_size = self.settings.ingest_batch_size
+        iterator = iter(documents)
+        batches = iter(lambda: list(islice(iterator, batch_size)), [])
+
+        first_batch = next(batches, [])
+        if not first_batch:
             raise VectorStoreException("No documents provided for initialization")
 
         try:
             persist_dir = Path(self.settings.chroma_persist_directory)
             persist_dir.mkdir(parents=True, exist_ok=True)
 
-            self.vector_store = Chroma.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
+            vector_store = Chroma(
+                embedding_function=self.embeddings,
                 collection_name=self.settings.chroma_collection_name,
                 persist_directory=str(persist_dir),
             )
-            logger.info(f"Vector store initialized with {len(documents)} documents")
+
+            counters: dict[str, int] = {}
+            total = 0
+            for batch in chain([first_batch], batches):
+                vector_store.add_documents(batch, ids=document_ids(batch, counters))
+                total += len(batch)
+                logger.info(f"Indexed {total} documents")
+
+            with self._lock:
+                self.vector_store = vector_store
+            logger.info(f"Vector store initialized with {total} documents")
+        except DocumentLoaderException:
+            raise
         except Exception as e:
             logger.error(f"Error initializing vector store: {e}")
             raise VectorStoreException(f"Failed to initialize vector store: {e}") from e
@@ -72,16 +114,92 @@ class VectorStoreManager:
             if not persist_dir.exists():
                 raise VectorStoreException(f"Persist directory does not exist: {persist_dir}")
 
-            self.vector_store = Chroma(
+            vector_store = Chroma(
                 embedding_function=self.embeddings,
                 collection_name=self.settings.chroma_collection_name,
                 persist_directory=str(persist_dir),
             )
+            with self._lock:
+                self.vector_store = vector_store
             logger.info("Vector store loaded successfully")
         except Exception as e:
             logger.error(f"Error loading vector store: {e}")
             raise VectorStoreException(f"Failed to load vector store: {e}") from e
 
+    def export_snapshot(self, path: str | Path) -> dict:
+        """
+        Exporta el índice a un snapshot versionado.
+
+        Solo la lectura del vector store se hace bajo el lock; la escritura
+        de archivos y los hashes se calculan sin bloquear las búsquedas.
+
+        Args:
+            path: Directorio destino del snapshot
+
+        Returns:
+            Manifest del snapshot
+
+        Raises:
+            VectorStoreException: Si vector store no está inicializado
+            SnapshotException: Si hay problemas exportando
+        """
+        if self.vector_store is None:
+            raise VectorStoreException("Vector store not initialized")
+
+        try:
+            with self._lock:
+                records = self.vector_store.get(include=["embeddings", "documents", "metadatas"])
+        except Exception as e:
+            raise SnapshotException(f"Failed to read vector store for snapshot: {e}") from e
+
+        return write_snapshot(records, self.settings, Path(path))
+
+    def load_snapshot(self, path: str | Path) -> None:
+        """
+        Carga el índice desde un snapshot sin volver a calcular embeddings.
+
+        El snapshot se verifica (versión, modelo de embeddings y sha256 de
+        cada archivo) antes de escribir nada en el vector store. Si la carga
+        falla sobre un directorio de persistencia vacío, el directorio se
+        elimina para que el siguiente arranque vuelva a intentar el snapshot
+        en lugar de abrir un índice a medias.
+
+        Args:
+            path: Directorio del snapshot
+
+        Raises:
+            SnapshotException: Si el snapshot es incompatible, está corrupto
+                o no se puede cargar
+        """
+        path = Path(path)
+        manifest = verify_snapshot(path, self.settings)
+
+        persist_dir = Path(self.settings.chroma_persist_directory)
+        fresh = not persist_dir.exists() or not any(persist_dir.iterdir())
+        try:
+            persist_dir.mkdir(parents=True, exist_ok=True)
+
+            vector_store = Chroma(
+                embedding_function=self.embeddings,
+                collection_name=self.settings.chroma_collection_name,
+                persist_directory=str(persist_dir),
+            )
+            for ids, embeddings, documents, metadatas in iter_snapshot_batches(
+                path, self.settings.ingest_batch_size
+            ):
+                upsert_with_embeddings(vector_store, ids, embeddings, documents, metadatas)
+
+            with self._lock:
+                self.vector_store = vector_store
+            logger.info(f"Vector store loaded from snapshot {path} ({manifest['count']} chunks)")
+        except Exception as e:
+            logger.error(f"Error loading snapshot: {e}")
+            if fresh:
+                shutil.rmtree(persist_dir, ignore_errors=True)
+            if isinstance(e, SnapshotException):
+                raise
+            raise SnapshotException(f"Failed to load snapshot {path}: {e}") from e
+
     def similarity_search(self, query: str, k: int = 4) -> list[Document]:
         """
         Busca documentos similares a la query.
@@ -100,13 +218,231 @@ class VectorStoreManager:
             raise VectorStoreException("Vector store not initialized")
 
         try:
-            results = self.vector_store.similarity_search(query, k=k)
+            embedding = self._query_batcher.embed_query(query)
+            with self._lock:
+                results = self.vector_store.similarity_search_by_vector(embedding, k=k)
             logger.info(f"Found {len(results)} similar documents")
             return results
         except Exception as e:
             logger.error(f"Error in similarity search: {e}")
             raise VectorStoreException(f"Similarity search failed: {e}") from e
 
+    def similarity_search_with_scores(
+        self, query: str, k: int = 4
+    ) -> list[tuple[Document, float]]:
+        """
+        Busca documentos similares devolviendo su puntuación de relevancia.
+
+        Args:
+            query: Query de búsqueda
+            k: Número de resultados a retornar
+
+        Returns:
+            Lista de (documento, relevancia) ordenada de mayor a menor. La
+            relevancia es la similitud coseno (ver `relevance_from_distance`),
+            en [-1, 1]
+
+        Raises:
+            VectorStoreException: Si hay problemas con la búsqueda
+        """
+        if self.vector_store is None:
+            raise VectorStoreException("Vector store not initialized")
+
+        try:
+            embedding = self._query_batcher.embed_query(query)
+            with self._lock:
+                results = self.vector_store.similarity_search_by_vector_with_relevance_scores(
+                    embedding, k=k
+                )
+            scored = [(doc, relevance_from_distance(distance)) for doc, distance in results]
+            scored.sort(key=lambda item: item[1], reverse=True)
+            logger.info(f"Found {len(scored)} similar documents")
+            return scored
+        except Exception as e:
+            logger.error(f"Error in similarity search: {e}")
+            raise VectorStoreException(f"Similarity search failed: {e}") from e
+
+    def adaptive_search(self, query: str, max_k: int) -> list[tuple[Document, float]]:
+        """
+        Busca documentos eligiendo k según la distribución de puntuaciones.
+
+        Recupera hasta `max_k` candidatos y se queda con los que superan
+        `rag_relevance_threshold`, cortando en el primer salto de puntuación
+        mayor que `rag_score_gap`. Una lista vacía indica que no hay contexto
+        relevante para la query.
+
+        Args:
+            query: Query de búsqueda
+            max_k: Número máximo de resultados
+
+        Returns:
+            Lista de (documento, relevancia) seleccionados
+
+        Raises:
+            VectorStoreException: Si hay problemas con la búsqueda
+        """
+        scored = self.similarity_search_with_scores(query, k=max_k)
+        selected = select_adaptive_k(
+            scored, self.settings.rag_relevance_threshold, self.settings.rag_score_gap
+        )
+        logger.info(f"Adaptive k: kept {len(selected)} of {len(scored)} candidates")
+        return selected
+
+    def indexed_sources(self) -> dict[str, float | None]:
+        """
+        Obtiene las fuentes indexadas y su fecha de modificación registrada.
+
+        Returns:
+            Dict con fuente -> mtime indexado (None si no se registró)
+
+        Raises:
+            VectorStoreException: Si hay problemas leyendo el vector store
+        """
+        if self.vector_store is None:
+            raise VectorStoreException("Vector store not initialized")
+
+        try:
+            with self._lock:
+                records = self.vector_store.get(include=["metadatas"])
+        except Exception as e:
+            logger.error(f"Error reading indexed sources: {e}")
+            raise VectorStoreException(f"Failed to read indexed sources: {e}") from e
+
+        sources: dict[str, float | None] = {}
+        for metadata in records.get("metadatas") or []:
+            if metadata and "source" in metadata:
+                sources[metadata["source"]] = metadata.get("mtime")
+        return sources
+
+    def source_hashes(self, sources: Iterable[str]) -> dict[str, str]:
+        """
+        Calcula el hash de contenido de fuentes indexadas.
+
+        Es el mismo hash que guarda el manifest de un snapshot por fuente
+        (ver `source_content_hash`).
+
+        Args:
+            sources: Fuentes indexadas a consultar
+
+        Returns:
+            Dict con fuente -> hash de contenido (solo las que existen)
+
+        Raises:
+            VectorStoreException: Si hay problemas leyendo el vector store
+        """
+        if self.vector_store is None:
+            raise VectorStoreException("Vector store not initialized")
+
+        sources = list(sources)
+        if not sources:
+            return {}
+
+        try:
+            with self._lock:
+                records = self.vector_store.get(
+                    where={"source": {"$in": sources}}, include=["documents", "metadatas"]
+                )
+        except Exception as e:
+            logger.error(f"Error reading source hashes: {e}")
+            raise VectorStoreException(f"Failed to read source hashes: {e}") from e
+
+        chunks: dict[str, list[str]] = {}
+        for text, metadata in zip(records["documents"], records["metadatas"], strict=True):
+            chunks.setdefault(metadata["source"], []).append(text)
+        return {source: source_content_hash(texts) for source, texts in chunks.items()}
+
+    def upsert_source(
+        self, source: str, documents: list[Document], previous_source: str | None = None
+    ) -> None:
+        """
+        Reemplaza todos los chunks de una fuente por los documentos dados.
+
+        Solo se calculan embeddings para los chunks cuyo texto no estaba ya
+        indexado en la fuente (o en `previous_source`, si el documento se ha
+        movido); el resto reutiliza los vectores existentes. Los embeddings
+        se calculan fuera del lock; el borrado de los chunks anteriores y la
+        inserción de los nuevos se aplican de forma atómica respecto a las
+        búsquedas concurrentes.
+
+        Args:
+            source: Fuente (ruta del archivo) a actualizar
+            documents: Documentos nuevos de la fuente
+            previous_source: Ruta anterior del mismo documento, cuyos chunks
+                se reutilizan y se eliminan (opcional)
+
+        Raises:
+            VectorStoreException: Si hay problemas actualizando
+        """
+        if self.vector_store is None:
+            raise VectorStoreException("Vector store not initialized")
+
+        if not documents:
+            self.delete_source(source)
+            if previous_source is not None:
+                self.delete_source(previous_source)
+            return
+
+        sources = [source] if previous_source is None else [source, previous_source]
+        try:
+            with self._lock:
+                existing = self.vector_store.get(
+                    where={"source": {"$in": sources}}, include=["embeddings", "documents"]
+                )
+            known = dict(zip(existing["documents"], existing["embeddings"], strict=True))
+
+            texts = [doc.page_content for doc in documents]
+            missing = list(dict.fromkeys(text for text in texts if text not in known))
+            if missing:
+                known.update(
+                    zip(missing, self.embeddings.embed_documents(missing), strict=True)
+                )
+            embeddings = [known[text] for text in texts]
+            ids = document_ids(documents)
+
+            with self._lock:
+                stale = self.vector_store.get(where={"source": {"$in": sources}}, include=[])
+                stale_ids = set(stale.get("ids") or []) - set(ids)
+                if stale_ids:
+                    self.vector_store.delete(ids=list(stale_ids))
+                upsert_with_embeddings(
+                    self.vector_store,
+                    ids,
+                    embeddings,
+                    texts,
+                    [doc.metadata for doc in documents],
+                )
+            logger.info(
+                f"Upserted {len(documents)} chunks from {source} "
+                f"({len(missing)} embedded, {len(texts) - len(missing)} reused)"
+            )
+        except Exception as e:
+            logger.error(f"Error upserting {source}: {e}")
+            raise VectorStoreException(f"Failed to upsert source {source}: {e}") from e
+
+    def delete_source(self, source: str) -> None:
+        """
+        Elimina todos los chunks de una fuente.
+
+        Args:
+            source: Fuente (ruta del archivo) a eliminar
+
+        Raises:
+            VectorStoreException: Si hay problemas eliminando
+        """
+        if self.vector_store is None:
+            raise VectorStoreException("Vector store not initialized")
+
+        try:
+            with self._lock:
+                stale = self.vector_store.get(where={"source": source}, include=[])
+                stale_ids = stale.get("ids") or []
+                if stale_ids:
+                    self.vector_store.delete(ids=stale_ids)
+            logger.info(f"Deleted {len(stale_ids)} chunks from {source}")
+        except Exception as e:
+            logger.error(f"Error deleting {source}: {e}")
+            raise VectorStoreException(f"Failed to delete source {source}: {e}") from e
+
     def get_vector_store(self) -> Chroma:
         """
         Obtiene la instancia de vector store.
@@ -120,3 +456,95 @@ class VectorStoreManager:
         if self.vector_store is None:
             raise VectorStoreException("Vector store not initialized")
         return self.vector_store
+
+
+def upsert_with_embeddings(
+    vector_store: Chroma,
+    ids: list[str],
+    embeddings: list[list[float]],
+    documents: list[str],
+    metadatas: list[dict],
+) -> None:
+    """
+    Inserta o actualiza chunks con embeddings ya calculados.
+
+    `Chroma.add_texts` siempre vuelve a embeber los textos, así que se
+    escribe directamente en la colección subyacente de chromadb. Es el único
+    punto que depende de ese atributo privado de langchain_chroma.
+
+    Args:
+        vector_store: Vector store destino
+        ids: Identificadores de los chunks
+        embeddings: Embedding de cada chunk
+        documents: Texto de cada chunk
+        metadatas: Metadatos de cada chunk
+    """
+    vector_store._collection.upsert(
+        ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas
+    )
+
+
+def relevance_from_distance(distance: float) -> float:
+    """
+    Convierte una distancia de Chroma en puntuación de relevancia.
+
+    Chroma usa por defecto la distancia L2 al cuadrado. Los embeddings de
+    Ollama están normalizados, y para vectores unitarios `1 - d / 2` es la
+    similitud coseno: 1 para textos idénticos, 0 para ortogonales y negativa
+    para opuestos.
+
+    Args:
+        distance: Distancia L2 al cuadrado devuelta por Chroma
+
+    Returns:
+        Relevancia en [-1, 1]
+    """
+    return 1.0 - distance / 2.0
+
+
+def select_adaptive_k(
+    scored: list[tuple[Document, float]], threshold: float, min_gap: float
+) -> list[tuple[Document, float]]:
+    """
+    Selecciona los resultados relevantes a partir de sus puntuaciones.
+
+    Args:
+        scored: Lista de (documento, relevancia) ordenada de mayor a menor
+        threshold: Relevancia mínima para conservar un resultado
+        min_gap: Salto de relevancia entre resultados consecutivos que corta la lista
+
+    Returns:
+        Prefijo de `scored` con los resultados seleccionados
+    """
+    selected: list[tuple[Document, float]] = []
+    for doc, score in scored:
+        if score < threshold:
+            break
+        if selected and selected[-1][1] - score > min_gap:
+            break
+        selected.append((doc, score))
+    return selected
+
+
+def document_ids(
+    documents: list[Document], counters: dict[str, int] | None = None
+) -> list[str]:
+    """
+    Genera ids deterministas por fuente para poder reemplazar chunks.
+
+    Args:
+        documents: Documentos a identificar
+        counters: Contadores por fuente a continuar entre lotes (opcional)
+
+    Returns:
+        Lista de ids con formato "<fuente>::<índice>"
+    """
+    if counters is None:
+        counters = {}
+    ids: list[str] = []
+    for doc in documents:
+        source = str(doc.metadata.get("source", "unknown"))
+        index = counters.get(source, 0)
+        counters[source] = index + 1
+        ids.append(f"{source}::{index}")
+    return ids
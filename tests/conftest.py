@@ -0,0 +1,15 @@
+"""Configuración común de los tests."""
+
+import sys
+import types
+from pathlib import Path
+
+# El código importa sus módulos como `src.<módulo>`, lo que solo resuelve si
+# el repositorio está en un directorio `src/`. Se registra la raíz con ese
+# nombre para que `pytest` funcione con cualquier nombre de checkout.
+ROOT = Path(__file__).resolve().parent.parent
+
+if "src" not in sys.modules:
+    package = types.ModuleType("src")
+    package.__path__ = [str(ROOT)]
+    sys.modules["src"] = package
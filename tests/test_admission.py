@@ -0,0 +1,263 @@
+"""Tests del control de admisión con un backend lento simulado."""
+
+import asyncio
+
+import pytest
+
+from src.config.settings import Settings
+from src.exceptions.exceptions import OverloadedException
+from src.utils.admission import AdmissionController, LoadLevel, current_budget
+
+
+def make_controller(**overrides) -> AdmissionController:
+    """Crea un controlador con un slot LLM y umbrales pequeños."""
+    values = {
+        "admission_max_inflight_embeddings": 2,
+        "admission_reduced_queue_depth": 1,
+        "admission_retrieval_only_queue_depth": 2,
+        "admission_max_queue_depth": 3,
+        "admission_queue_timeout_seconds": 5.0,
+        "degraded_k": 2,
+        "degraded_max_output_tokens": 128,
+        **overrides,
+    }
+    return AdmissionController(Settings(_env_file=None, **values), llm_slots=1)
+
+
+async def settle() -> None:
+    """Deja avanzar a las tareas pendientes hasta que se bloqueen."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def slow_answer(release: asyncio.Event):
+    """Backend LLM simulado que responde con el nivel del presupuesto."""
+
+    async def answer() -> str:
+        await release.wait()
+        return f"llm:{current_budget().level.value}"
+
+    return answer
+
+
+async def retrieval_answer() -> str:
+    return "retrieval"
+
+
+def test_normal_request_gets_full_budget():
+    async def scenario():
+        controller = make_controller()
+        release = asyncio.Event()
+        release.set()
+        return await controller.submit(slow_answer(release), retrieval_answer), controller
+
+    (answer, level), controller = asyncio.run(scenario())
+
+    assert (answer, level) == ("llm:normal", LoadLevel.NORMAL)
+    assert controller.counters["normal"] == 1
+    assert controller.stats()["inflight_llm"] == 0
+
+
+def test_queued_requests_are_reduced_then_retrieval_only():
+    async def scenario():
+        controller = make_controller()
+        release = asyncio.Event()
+        tasks = []
+        for _ in range(4):
+            tasks.append(
+                asyncio.create_task(controller.submit(slow_answer(release), retrieval_answer))
+            )
+            await settle()
+        queued = controller.queued
+        release.set()
+        return queued, await asyncio.gather(*tasks)
+
+    queued, results = asyncio.run(scenario())
+
+    assert queued == 2
+    assert [level for _, level in results] == [
+        LoadLevel.NORMAL,
+        LoadLevel.NORMAL,
+        LoadLevel.REDUCED,
+        LoadLevel.RETRIEVAL_ONLY,
+    ]
+    assert results[2][0] == "llm:reduced"
+    assert results[3][0] == "retrieval"
+
+
+def test_reduced_budget_limits_k_and_tokens():
+    controller = make_controller()
+
+    budget = controller.budget_for(LoadLevel.REDUCED)
+
+    assert budget.max_k == 2
+    assert budget.max_output_tokens == 128
+    assert controller.budget_for(LoadLevel.NORMAL).max_k is None
+
+
+def test_retrieval_only_requests_count_against_queue_bound():
+    async def scenario():
+        controller = make_controller()
+        release = asyncio.Event()
+        retrieval_release = asyncio.Event()
+
+        async def slow_retrieval() -> str:
+            await retrieval_release.wait()
+            return "retrieval"
+
+        tasks = []
+        for _ in range(4):
+            tasks.append(
+                asyncio.create_task(controller.submit(slow_answer(release), slow_retrieval))
+            )
+            await settle()
+
+        with pytest.raises(OverloadedException, match="queue depth 3"):
+            await controller.submit(slow_answer(release), slow_retrieval)
+
+        release.set()
+        retrieval_release.set()
+        await asyncio.gather(*tasks)
+        return controller
+
+    controller = asyncio.run(scenario())
+
+    assert controller.counters["shed"] == 1
+    assert controller.stats()["pending_retrieval_only"] == 0
+
+
+def test_retrieval_only_waits_for_embedding_slot_and_times_out():
+    async def scenario():
+        controller = make_controller(
+            admission_max_inflight_embeddings=1,
+            admission_max_queue_depth=4,
+            admission_queue_timeout_seconds=0.05,
+        )
+        release = asyncio.Event()
+        retrieval_release = asyncio.Event()
+
+        async def slow_retrieval() -> str:
+            await retrieval_release.wait()
+            return "retrieval"
+
+        tasks = []
+        for _ in range(3):
+            tasks.append(
+                asyncio.create_task(controller.submit(slow_answer(release), slow_retrieval))
+            )
+            await settle()
+        retrieval_task = asyncio.create_task(
+            controller.submit(slow_answer(release), slow_retrieval)
+        )
+        await settle()
+
+        with pytest.raises(OverloadedException, match="for an embedding slot"):
+            await controller.submit(slow_answer(release), slow_retrieval)
+
+        retrieval_release.set()
+        await retrieval_task
+        release.set()
+        # Las consultas en cola para el LLM también expiran con este timeout
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return controller
+
+    controller = asyncio.run(scenario())
+
+    assert controller.counters["retrieval_only"] == 1
+    assert controller.stats()["pending_retrieval_only"] == 0
+
+
+def test_waiting_for_query_slot_times_out():
+    async def scenario():
+        controller = make_controller(admission_queue_timeout_seconds=0.05)
+        release = asyncio.Event()
+        holder = asyncio.create_task(controller.submit(slow_answer(release), retrieval_answer))
+        await settle()
+
+        with pytest.raises(OverloadedException, match="for a query slot"):
+            await controller.submit(slow_answer(release), retrieval_answer)
+
+        queued = controller.queued
+        release.set()
+        await holder
+        return controller, queued
+
+    controller, queued = asyncio.run(scenario())
+
+    assert queued == 0
+    assert controller.counters["shed"] == 1
+    assert controller.counters["normal"] == 1
+
+
+def test_llm_slots_are_taken_per_model_call():
+    async def scenario():
+        controller = make_controller()
+        release = asyncio.Event()
+
+        async def model_call() -> str:
+            async with controller.llm_call():
+                await release.wait()
+            return "llm"
+
+        async def hedged_answer() -> str:
+            answers = await asyncio.gather(model_call(), model_call())
+            return "+".join(answers)
+
+        task = asyncio.create_task(controller.submit(hedged_answer, retrieval_answer))
+        await settle()
+        during = controller.stats()
+        release.set()
+        return during, await task, controller.stats()
+
+    during, (answer, level), after = asyncio.run(scenario())
+
+    assert (answer, level) == ("llm+llm", LoadLevel.NORMAL)
+    assert (during["active_queries"], during["inflight_llm"], during["waiting_llm"]) == (1, 1, 1)
+    assert (after["active_queries"], after["inflight_llm"], after["waiting_llm"]) == (0, 0, 0)
+
+
+def test_cancelled_model_call_releases_llm_slot():
+    async def scenario():
+        controller = make_controller(admission_queue_timeout_seconds=0.5)
+
+        async def hung_call() -> None:
+            async with controller.llm_call():
+                await asyncio.Event().wait()
+
+        loser = asyncio.create_task(hung_call())
+        await settle()
+        loser.cancel()
+        await asyncio.gather(loser, return_exceptions=True)
+
+        async with controller.llm_call():
+            return controller.stats()["inflight_llm"]
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_waiting_model_calls_degrade_new_requests():
+    async def scenario():
+        controller = make_controller()
+        release = asyncio.Event()
+
+        async def model_call() -> None:
+            async with controller.llm_call():
+                await release.wait()
+
+        calls = [asyncio.create_task(model_call()) for _ in range(2)]
+        await settle()
+        level = controller.level()
+        release.set()
+        await asyncio.gather(*calls)
+        return level
+
+    assert asyncio.run(scenario()) is LoadLevel.REDUCED
+
+
+def test_settings_reject_unordered_admission_thresholds():
+    with pytest.raises(ValueError, match="admission_reduced_queue_depth"):
+        Settings(
+            _env_file=None,
+            admission_reduced_queue_depth=12,
+            admission_retrieval_only_queue_depth=4,
+        )
@@ -0,0 +1,45 @@
+"""Tests de las utilidades del modo batch."""
+
+import json
+
+import pytest
+
+from src.utils.batch import latency_summary, load_completed_ids
+
+
+def test_latency_summary_empty():
+    assert latency_summary([]) == {}
+
+
+def test_latency_summary_single_value():
+    assert latency_summary([1.5]) == {"mean": 1.5, "p50": 1.5, "p90": 1.5, "p99": 1.5, "max": 1.5}
+
+
+def test_latency_summary_percentiles():
+    summary = latency_summary([float(i) for i in range(1, 102)])
+
+    assert summary["mean"] == pytest.approx(51.0)
+    assert summary["p50"] == pytest.approx(51.0)
+    assert summary["p90"] == pytest.approx(91.0)
+    assert summary["p99"] == pytest.approx(100.0)
+    assert summary["max"] == 101.0
+
+
+def test_load_completed_ids_missing_file(tmp_path):
+    assert load_completed_ids(tmp_path / "missing.jsonl") == set()
+
+
+def test_load_completed_ids_skips_errors_degraded_and_partial_lines(tmp_path):
+    output = tmp_path / "answers.jsonl"
+    rows = [
+        {"id": "ok", "status": "ok", "level": "normal"},
+        {"id": "reduced", "status": "ok", "level": "reduced"},
+        {"id": "retrieval", "status": "ok", "level": "retrieval_only"},
+        {"id": "failed", "status": "error", "error": "boom"},
+    ]
+    output.write_text(
+        "".join(json.dumps(row) + "\n" for row in rows) + '{"id": "partial", "sta',
+        encoding="utf-8",
+    )
+
+    assert load_completed_ids(output) == {"ok"}
@@ -0,0 +1,55 @@
+"""Tests de la carga y normalización de documentos."""
+
+import json
+
+from src.rag.document_loader import load_file, normalize_markdown, normalize_whitespace
+
+
+def test_normalize_whitespace_keeps_indentation():
+    text = "Ejemplo:  \ndef greet(name):\n    return name\t\n\n\n\nFin\n"
+
+    assert normalize_whitespace(text) == "Ejemplo:\ndef greet(name):\n    return name\n\nFin"
+
+
+def test_normalize_markdown_strips_syntax():
+    text = "# Título\n\nTexto con **negrita**, *cursiva* y `código`.\n\n- uno\n- dos\n"
+
+    assert normalize_markdown(text) == "Título\n\nTexto con negrita, cursiva y código.\n\nuno\ndos"
+
+
+def test_normalize_markdown_keeps_link_and_image_text():
+    text = "Ver [la guía](https://example.com) y ![diagrama](img.png)."
+
+    assert normalize_markdown(text) == "Ver la guía y diagrama."
+
+
+def test_normalize_markdown_removes_front_matter_and_fences():
+    text = "---\ntitle: Doc\n---\nAntes\n```python\nprint(1)\n```\nDespués"
+
+    assert normalize_markdown(text) == "Antes\n\nprint(1)\n\nDespués"
+
+
+def test_normalize_markdown_preserves_snake_case():
+    text = "Usa la variable documents_path y un _énfasis_."
+
+    assert normalize_markdown(text) == "Usa la variable documents_path y un énfasis."
+
+
+def test_load_jsonl_skips_malformed_lines(tmp_path):
+    path = tmp_path / "export.jsonl"
+    path.write_text(
+        "\n".join(
+            [
+                json.dumps({"id": 1, "text": "Primera"}),
+                '{"id": 2, "text": "sin cerrar"',
+                json.dumps(["no", "es", "un", "objeto"]),
+                json.dumps({"id": 4, "text": "Cuarta"}),
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    documents = load_file(path)
+
+    assert [doc.page_content for doc in documents] == ["Primera", "Cuarta"]
+    assert [doc.metadata["line"] for doc in documents] == [1, 4]
@@ -0,0 +1,126 @@
+"""Tests de la reconciliación del observador de documentos."""
+
+import os
+
+import pytest
+
+from src.config.settings import Settings
+from src.rag.document_watcher import DocumentWatcher
+from src.rag.snapshot import source_content_hash
+
+
+class FakeVectorStoreManager:
+    """Vector store en memoria que registra las operaciones recibidas."""
+
+    def __init__(self) -> None:
+        self.contents: dict[str, list[str]] = {}
+        self.upserts: list[tuple[str, str | None]] = []
+        self.deletes: list[str] = []
+
+    def indexed_sources(self) -> dict[str, float | None]:
+        return {source: None for source in self.contents}
+
+    def upsert_source(self, source, documents, previous_source=None) -> None:
+        self.upserts.append((source, previous_source))
+        if previous_source is not None:
+            self.contents.pop(previous_source, None)
+        self.contents[source] = [doc.page_content for doc in documents]
+
+    def delete_source(self, source) -> None:
+        self.deletes.append(source)
+        self.contents.pop(source, None)
+
+    def source_hashes(self, sources) -> dict[str, str]:
+        return {
+            source: source_content_hash(self.contents[source])
+            for source in sources
+            if source in self.contents
+        }
+
+
+@pytest.fixture
+def documents_dir(tmp_path):
+    path = tmp_path / "documents"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def manager():
+    return FakeVectorStoreManager()
+
+
+@pytest.fixture
+def watcher(documents_dir, manager):
+    settings = Settings(
+        _env_file=None,
+        documents_path=str(documents_dir),
+        documents_watch_debounce_seconds=0.0,
+    )
+    return DocumentWatcher(manager, settings)
+
+
+def test_sync_indexes_new_files(watcher, manager, documents_dir):
+    path = documents_dir / "guia.txt"
+    path.write_text("Contenido de la guía.")
+
+    watcher.sync()
+
+    assert manager.upserts == [(str(path), None)]
+    assert manager.contents[str(path)] == ["Contenido de la guía."]
+
+
+def test_sync_reindexes_only_modified_files(watcher, manager, documents_dir):
+    changed = documents_dir / "cambia.txt"
+    unchanged = documents_dir / "igual.txt"
+    changed.write_text("Versión 1.")
+    unchanged.write_text("Sin cambios.")
+    watcher.sync()
+    manager.upserts.clear()
+
+    changed.write_text("Versión 2.")
+    mtime = changed.stat().st_mtime + 10
+    os.utime(changed, (mtime, mtime))
+    watcher.sync()
+
+    assert manager.upserts == [(str(changed), None)]
+    assert manager.contents[str(changed)] == ["Versión 2."]
+
+
+def test_sync_removes_deleted_files(watcher, manager, documents_dir):
+    path = documents_dir / "borrar.txt"
+    path.write_text("Temporal.")
+    watcher.sync()
+
+    path.unlink()
+    watcher.sync()
+
+    assert manager.deletes == [str(path)]
+    assert manager.contents == {}
+
+
+def test_sync_keeps_index_when_directory_is_missing(watcher, manager, documents_dir):
+    path = documents_dir / "guia.txt"
+    path.write_text("Contenido de la guía.")
+    watcher.sync()
+
+    path.unlink()
+    documents_dir.rmdir()
+    watcher.sync()
+
+    assert manager.deletes == []
+    assert str(path) in manager.contents
+
+
+def test_sync_reuses_embeddings_for_moved_files(watcher, manager, documents_dir):
+    old_path = documents_dir / "antes.txt"
+    old_path.write_text("Mismo contenido.")
+    watcher.sync()
+
+    new_path = documents_dir / "despues.txt"
+    old_path.rename(new_path)
+    watcher.sync()
+
+    assert manager.upserts[-1] == (str(new_path), str(old_path))
+    assert manager.deletes == []
+    assert manager.contents == {str(new_path): ["Mismo contenido."]}
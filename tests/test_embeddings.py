@@ -0,0 +1,70 @@
+"""Tests de la agrupación de embeddings de queries."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.rag.embeddings import QueryEmbeddingBatcher
+
+
+class FakeEmbeddings:
+    """Embeddings deterministas que registran cada llamada al modelo."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.calls: list[list[str]] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+def embed_concurrently(batcher: QueryEmbeddingBatcher, queries: list[str]) -> list:
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        return list(pool.map(batcher.embed_query, queries))
+
+
+def test_concurrent_queries_share_one_model_call():
+    embeddings = FakeEmbeddings()
+    batcher = QueryEmbeddingBatcher(embeddings, window_seconds=0.2, max_batch_size=32)
+
+    vectors = embed_concurrently(batcher, ["a", "bb", "ccc", "bb"])
+
+    assert vectors == [[1.0], [2.0], [3.0], [2.0]]
+    assert len(embeddings.calls) == 1
+    assert sorted(embeddings.calls[0]) == ["a", "bb", "ccc"]
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window():
+    embeddings = FakeEmbeddings()
+    batcher = QueryEmbeddingBatcher(embeddings, window_seconds=0.2, max_batch_size=2)
+
+    vectors = embed_concurrently(batcher, ["a", "bb", "ccc", "dddd"])
+
+    assert vectors == [[1.0], [2.0], [3.0], [4.0]]
+    assert sorted(len(call) for call in embeddings.calls) == [2, 2]
+
+
+def test_zero_window_embeds_each_query():
+    embeddings = FakeEmbeddings()
+    batcher = QueryEmbeddingBatcher(embeddings, window_seconds=0, max_batch_size=32)
+
+    assert batcher.embed_query("abc") == [3.0]
+    assert embeddings.calls == [["abc"]]
+
+
+def test_model_errors_reach_every_waiting_query():
+    embeddings = FakeEmbeddings(error=RuntimeError("ollama caído"))
+    batcher = QueryEmbeddingBatcher(embeddings, window_seconds=0.2, max_batch_size=32)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(batcher.embed_query, query) for query in ("a", "b")]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="ollama caído"):
+                future.result()
+    assert len(embeddings.calls) == 1
@@ -0,0 +1,59 @@
+"""Tests de la elección de respuesta en el modo especulativo."""
+
+import pytest
+from google.adk.agents import Agent
+
+from src.agent.orchestrator import SpeculativeExecutor
+from src.config.settings import Settings
+
+RAG_ANSWER = "Según la documentación, Python usa indentación para los bloques."
+WEB_ANSWER = "Python es un lenguaje interpretado de alto nivel."
+NO_INFO = "No encontré información sobre eso en los documentos."
+
+
+@pytest.fixture
+def executor():
+    rag_agent = Agent(name="rag_agent", model="test-model")
+    web_agent = Agent(name="web_agent", model="test-model")
+    return SpeculativeExecutor(rag_agent, web_agent, Settings(_env_file=None))
+
+
+def test_preferred_answer_wins_when_adequate(executor):
+    answers = {"web_agent": WEB_ANSWER, "rag_agent": RAG_ANSWER}
+
+    assert executor._pick_winner(answers, has_context=True, probing=True) == "rag_agent"
+
+
+def test_waits_for_preferred_while_probe_is_pending(executor):
+    answers = {"web_agent": WEB_ANSWER}
+
+    assert executor._pick_winner(answers, has_context=None, probing=True) is None
+
+
+def test_waits_for_preferred_when_probe_found_context(executor):
+    answers = {"web_agent": WEB_ANSWER}
+
+    assert executor._pick_winner(answers, has_context=True, probing=True) is None
+
+
+def test_other_agent_wins_when_probe_found_no_context(executor):
+    answers = {"web_agent": WEB_ANSWER}
+
+    assert executor._pick_winner(answers, has_context=False, probing=True) == "web_agent"
+
+
+def test_other_agent_wins_without_probe(executor):
+    answers = {"web_agent": WEB_ANSWER}
+
+    assert executor._pick_winner(answers, has_context=None, probing=False) == "web_agent"
+
+
+def test_inadequate_preferred_answer_is_rejected(executor):
+    answers = {"rag_agent": NO_INFO, "web_agent": WEB_ANSWER}
+
+    assert executor._pick_winner(answers, has_context=True, probing=True) == "web_agent"
+
+
+@pytest.mark.parametrize("answers", [{}, {"rag_agent": NO_INFO}, {"web_agent": "  "}])
+def test_no_winner_without_adequate_answers(executor, answers):
+    assert executor._pick_winner(answers, has_context=False, probing=True) is None
@@ -0,0 +1,124 @@
+"""Tests de la recuperación del agente RAG."""
+
+import asyncio
+
+from langchain_core.documents import Document
+
+from src.agent.sub_agents.rag_agent import (
+    DEFAULT_K,
+    NO_RELEVANT_CONTEXT_MESSAGE,
+    create_search_tool,
+    query_rag_agent,
+)
+from src.config.settings import Settings
+from src.exceptions.exceptions import VectorStoreException
+from src.utils.admission import LoadBudget, LoadLevel, _current_budget
+
+
+class FakeVectorStoreManager:
+    """Vector store que devuelve resultados fijos y registra el k pedido."""
+
+    def __init__(self, results=None, error: Exception | None = None) -> None:
+        self.results = results or []
+        self.error = error
+        self.calls: list[tuple[str, int]] = []
+
+    def adaptive_search(self, query, max_k):
+        return self._search("adaptive", max_k)
+
+    def similarity_search_with_scores(self, query, k):
+        return self._search("similarity", k)
+
+    def _search(self, method, k):
+        self.calls.append((method, k))
+        if self.error is not None:
+            raise self.error
+        return self.results[:k]
+
+
+def make_settings(**overrides) -> Settings:
+    return Settings(_env_file=None, rag_max_k=6, rag_snippet_max_chars=20, **overrides)
+
+
+def search(manager, settings, budget: LoadBudget | None = None, **kwargs) -> dict:
+    async def scenario():
+        if budget is not None:
+            _current_budget.set(budget)
+        return await create_search_tool(manager, settings)("pregunta", **kwargs)
+
+    return asyncio.run(scenario())
+
+
+def test_adaptive_search_requests_rag_max_k_by_default():
+    manager = FakeVectorStoreManager()
+
+    search(manager, make_settings(rag_adaptive_k=True))
+
+    assert manager.calls == [("adaptive", 6)]
+
+
+def test_plain_search_uses_default_k():
+    manager = FakeVectorStoreManager()
+
+    search(manager, make_settings(rag_adaptive_k=False))
+
+    assert manager.calls == [("similarity", DEFAULT_K)]
+
+
+def test_k_is_clamped_to_rag_max_k_and_budget():
+    manager = FakeVectorStoreManager()
+    settings = make_settings(rag_adaptive_k=False)
+
+    search(manager, settings, k=50)
+    search(manager, settings, k=0)
+    search(manager, settings, LoadBudget(level=LoadLevel.REDUCED, max_k=2), k=5)
+
+    assert manager.calls == [("similarity", 6), ("similarity", 1), ("similarity", 2)]
+
+
+def test_results_include_source_id_score_and_snippet():
+    doc = Document(
+        page_content="Python usa indentación para delimitar bloques.",
+        metadata={"source": "/docs/python_guide.txt", "line": 3},
+    )
+    manager = FakeVectorStoreManager(results=[(doc, 0.87654)])
+
+    result = search(manager, make_settings())
+
+    assert result == {
+        "status": "success",
+        "results": [
+            {"source_id": "python_guide.txt#3", "score": 0.877, "snippet": "Python usa…"}
+        ],
+    }
+
+
+def test_no_results_report_no_relevant_context():
+    result = search(FakeVectorStoreManager(), make_settings())
+
+    assert result == {
+        "status": "no_relevant_context",
+        "message": NO_RELEVANT_CONTEXT_MESSAGE,
+        "results": [],
+    }
+
+
+def test_vector_store_errors_are_returned():
+    manager = FakeVectorStoreManager(error=VectorStoreException("índice no disponible"))
+
+    result = search(manager, make_settings())
+
+    assert result == {"status": "error", "error_message": "índice no disponible"}
+
+
+def test_query_rag_agent_resolves_k_like_search_documents():
+    manager = FakeVectorStoreManager()
+    adaptive, plain = make_settings(rag_adaptive_k=True), make_settings(rag_adaptive_k=False)
+
+    answers = [
+        asyncio.run(query_rag_agent(None, manager, "pregunta", settings=settings))
+        for settings in (adaptive, plain)
+    ]
+
+    assert answers == [NO_RELEVANT_CONTEXT_MESSAGE] * 2
+    assert manager.calls == [("adaptive", 6), ("similarity", DEFAULT_K)]
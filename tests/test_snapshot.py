@@ -0,0 +1,86 @@
+"""Tests de la verificación de snapshots del índice."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.config.settings import Settings
+from src.exceptions.exceptions import SnapshotException
+from src.rag.snapshot import (
+    MANIFEST_FILE,
+    RECORDS_FILE,
+    VECTORS_FILE,
+    iter_snapshot_batches,
+    verify_snapshot,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def settings() -> Settings:
+    return Settings(_env_file=None, ollama_embedding_model="embeddinggemma")
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, settings):
+    records = {
+        "ids": ["a.txt::0", "a.txt::1", "b.txt::0"],
+        "documents": ["uno", "dos", "tres"],
+        "metadatas": [{"source": "a.txt"}, {"source": "a.txt"}, None],
+        "embeddings": np.arange(9, dtype=np.float32).reshape(3, 3),
+    }
+    path = tmp_path / "snapshot"
+    write_snapshot(records, settings, path)
+    return path
+
+
+def test_verify_snapshot_accepts_valid_snapshot(snapshot_path, settings):
+    manifest = verify_snapshot(snapshot_path, settings)
+
+    assert manifest["count"] == 3
+    assert manifest["dimension"] == 3
+    assert set(manifest["sources"]) == {"a.txt", "unknown"}
+
+
+def test_snapshot_round_trip(snapshot_path, settings):
+    verify_snapshot(snapshot_path, settings)
+
+    batches = list(iter_snapshot_batches(snapshot_path, batch_size=2))
+
+    assert [ids for ids, _, _, _ in batches] == [["a.txt::0", "a.txt::1"], ["b.txt::0"]]
+    assert batches[1][3] == [None]
+    np.testing.assert_array_equal(batches[1][1], [[6, 7, 8]])
+
+
+def test_verify_snapshot_rejects_other_embedding_model(snapshot_path):
+    other = Settings(_env_file=None, ollama_embedding_model="nomic-embed-text")
+
+    with pytest.raises(SnapshotException, match="embedding model"):
+        verify_snapshot(snapshot_path, other)
+
+
+def test_verify_snapshot_rejects_unknown_format_version(snapshot_path, settings):
+    manifest_path = snapshot_path / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["format_version"] = 999
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    with pytest.raises(SnapshotException, match="format version"):
+        verify_snapshot(snapshot_path, settings)
+
+
+@pytest.mark.parametrize("name", [VECTORS_FILE, RECORDS_FILE])
+def test_verify_snapshot_detects_corruption(snapshot_path, settings, name):
+    with (snapshot_path / name).open("ab") as f:
+        f.write(b"corrupt")
+
+    with pytest.raises(SnapshotException, match="sha256 mismatch"):
+        verify_snapshot(snapshot_path, settings)
+
+
+def test_verify_snapshot_detects_missing_file(snapshot_path, settings):
+    (snapshot_path / RECORDS_FILE).unlink()
+
+    with pytest.raises(SnapshotException, match="missing"):
+        verify_snapshot(snapshot_path, settings)
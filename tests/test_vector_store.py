@@ -0,0 +1,39 @@
+"""Tests de la selección adaptativa de k."""
+
+from langchain_core.documents import Document
+
+from src.rag.vector_store import relevance_from_distance, select_adaptive_k
+
+
+def scored(*scores: float) -> list[tuple[Document, float]]:
+    """Construye resultados con las puntuaciones dadas."""
+    return [(Document(page_content=f"doc {i}"), score) for i, score in enumerate(scores)]
+
+
+def test_select_adaptive_k_keeps_strong_cluster():
+    results = scored(0.82, 0.8, 0.79, 0.77, 0.75, 0.74)
+
+    assert select_adaptive_k(results, threshold=0.3, min_gap=0.15) == results
+
+
+def test_select_adaptive_k_cuts_at_score_gap():
+    results = scored(0.9, 0.85, 0.5, 0.45)
+
+    assert select_adaptive_k(results, threshold=0.3, min_gap=0.15) == results[:2]
+
+
+def test_select_adaptive_k_drops_results_below_threshold():
+    results = scored(0.4, 0.35, 0.25, 0.2)
+
+    assert select_adaptive_k(results, threshold=0.3, min_gap=0.15) == results[:2]
+
+
+def test_select_adaptive_k_returns_empty_without_relevant_context():
+    assert select_adaptive_k(scored(0.2, 0.1), threshold=0.3, min_gap=0.15) == []
+    assert select_adaptive_k([], threshold=0.3, min_gap=0.15) == []
+
+
+def test_relevance_from_distance_is_cosine_similarity():
+    assert relevance_from_distance(0.0) == 1.0
+    assert relevance_from_distance(2.0) == 0.0
+    assert relevance_from_distance(4.0) == -1.0
@@ -0,0 +1,374 @@
+"""
+Control de admisión y degradación bajo carga.
+
+Este módulo limita el trabajo simultáneo que llega a Ollama. Cuenta las
+consultas en servicio, las llamadas reales al modelo y de embeddings en
+curso y la profundidad de la cola. Con la carga creciente degrada las respuestas: primero usa un k menor y menos
+tokens de salida, después responde solo con recuperación y, al final,
+rechaza consultas con un error explícito en lugar de dejarlas expirar.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+from src.config.settings import Settings, get_settings
+from src.exceptions.exceptions import OverloadedException
+
+logger = logging.getLogger(__name__)
+
+
+class LoadLevel(str, Enum):
+    """Nivel de servicio aplicado a una consulta."""
+
+    NORMAL = "normal"
+    REDUCED = "reduced"
+    RETRIEVAL_ONLY = "retrieval_only"
+
+
+@dataclass(frozen=True)
+class LoadBudget:
+    """
+    Presupuesto de recursos de una consulta admitida.
+
+    Attributes:
+        level: Nivel de servicio
+        max_k: Máximo de fragmentos a recuperar (None = sin límite extra)
+        max_output_tokens: Máximo de tokens generados (None = sin límite)
+    """
+
+    level: LoadLevel = LoadLevel.NORMAL
+    max_k: int | None = None
+    max_output_tokens: int | None = None
+
+
+_current_budget: ContextVar[LoadBudget] = ContextVar("load_budget", default=LoadBudget())
+
+
+def current_budget() -> LoadBudget:
+    """
+    Obtiene el presupuesto de la consulta en curso.
+
+    Returns:
+        Presupuesto fijado por el controlador de admisión, o el normal
+    """
+    return _current_budget.get()
+
+
+def apply_load_budget(
+    callback_context: CallbackContext,  # noqa: ARG001
+    llm_request: LlmRequest,
+) -> LlmResponse | None:
+    """
+    Callback `before_model_callback` que limita los tokens de salida.
+
+    Args:
+        callback_context: Contexto del callback de ADK
+        llm_request: Petición al modelo a ajustar
+
+    Returns:
+        None, para que la petición continúe con el límite aplicado
+    """
+    budget = current_budget()
+    if budget.max_output_tokens is not None and llm_request.config is not None:
+        llm_request.config.max_output_tokens = budget.max_output_tokens
+    return None
+
+
+def llm_slots_for(settings: Settings) -> int:
+    """
+    Calcula cuántas llamadas LLM simultáneas admitir según el hardware.
+
+    Args:
+        settings: Configuración del sistema
+
+    Returns:
+        Número de slots LLM
+    """
+    if not settings.require_gpu:
+        return 1
+    devices = [d for d in settings.cuda_visible_devices.split(",") if d.strip()]
+    return max(1, len(devices)) * settings.admission_llm_slots_per_gpu
+
+
+class AdmissionController:
+    """
+    Controlador de admisión delante del runner.
+
+    Las consultas esperan en cola un slot de consulta. Según la profundidad
+    de la cola, las llamadas al modelo en espera y los embeddings en curso,
+    cada consulta recibe un presupuesto que las tools y callbacks consultan
+    con `current_budget()`. Las respuestas solo con recuperación no esperan
+    slot de consulta sino uno de embeddings, y cuentan para el límite
+    `admission_max_queue_depth` hasta que terminan.
+
+    Una consulta hace varias llamadas al modelo (orquestador y sub-agentes,
+    dos a la vez en modo especulativo), así que los slots LLM se ocupan por
+    llamada con `llm_call()`, no por consulta.
+    """
+
+    def __init__(self, settings: Settings | None = None, llm_slots: int | None = None) -> None:
+        """
+        Inicializa el controlador.
+
+        Args:
+            settings: Configuración del sistema (opcional)
+            llm_slots: Slots LLM simultáneos (opcional, se deriva de la GPU)
+        """
+        self.settings = settings or get_settings()
+        self.llm_slots = llm_slots or llm_slots_for(self.settings)
+        self._queries = asyncio.Semaphore(self.llm_slots)
+        self._llm = asyncio.Semaphore(self.llm_slots)
+        self._retrieval = asyncio.Semaphore(self.settings.admission_max_inflight_embeddings)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active_queries = 0
+        self.waiting_llm = 0
+        self.inflight_llm = 0
+        self.pending_retrieval_only = 0
+        self.inflight_embeddings = 0
+        self.counters: dict[str, int] = dict.fromkeys(
+            [*(level.value for level in LoadLevel), "shed"], 0
+        )
+
+    def level(self) -> LoadLevel:
+        """
+        Determina el nivel de servicio según la carga actual.
+
+        Returns:
+            Nivel de servicio para una nueva consulta
+        """
+        backlog = self.queued + self.waiting_llm
+        if backlog >= self.settings.admission_retrieval_only_queue_depth:
+            return LoadLevel.RETRIEVAL_ONLY
+        if (
+            backlog >= self.settings.admission_reduced_queue_depth
+            or self.inflight_embeddings >= self.settings.admission_max_inflight_embeddings
+        ):
+            return LoadLevel.REDUCED
+        return LoadLevel.NORMAL
+
+    def budget_for(self, level: LoadLevel) -> LoadBudget:
+        """
+        Construye el presupuesto de recursos de un nivel.
+
+        Args:
+            level: Nivel de servicio
+
+        Returns:
+            Presupuesto correspondiente
+        """
+        if level is LoadLevel.NORMAL:
+            return LoadBudget()
+        return LoadBudget(
+            level=level,
+            max_k=self.settings.degraded_k,
+            max_output_tokens=self.settings.degraded_max_output_tokens,
+        )
+
+    def _shed(self, reason: str) -> OverloadedException:
+        """Registra una consulta rechazada y construye el error."""
+        self.counters["shed"] += 1
+        logger.warning(f"Load shedding: {reason} ({self.stats()})")
+        return OverloadedException(f"Sistema saturado ({reason}). Reintentar en unos segundos.")
+
+    async def _acquire(self, semaphore: asyncio.Semaphore, slot: str) -> None:
+        """
+        Espera un slot con el timeout de admisión.
+
+        Args:
+            semaphore: Semáforo del recurso a esperar
+            slot: Descripción del slot para el mensaje de error
+
+        Raises:
+            OverloadedException: Si la espera expira
+        """
+        try:
+            await asyncio.wait_for(
+                semaphore.acquire(), timeout=self.settings.admission_queue_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            raise self._shed(
+                f"waited {self.settings.admission_queue_timeout_seconds}s for {slot}"
+            ) from None
+
+    async def submit(
+        self,
+        answer: Callable[[], Awaitable[str]],
+        retrieval_only: Callable[[], Awaitable[str]],
+    ) -> tuple[str, LoadLevel]:
+        """
+        Admite, degrada o rechaza una consulta.
+
+        Args:
+            answer: Ejecuta la consulta completa con el LLM
+            retrieval_only: Respuesta sin LLM, usada con carga alta
+
+        Returns:
+            Tupla con la respuesta y el nivel de servicio aplicado
+
+        Raises:
+            OverloadedException: Si la cola está llena o la espera de un slot
+                de consulta, LLM o de embeddings expira
+        """
+        depth = self.queued + self.pending_retrieval_only
+        if depth >= self.settings.admission_max_queue_depth:
+            raise self._shed(f"queue depth {depth}")
+
+        level = self.level()
+        budget = self.budget_for(level)
+        token = _current_budget.set(budget)
+        try:
+            if level is LoadLevel.RETRIEVAL_ONLY:
+                self.pending_retrieval_only += 1
+                try:
+                    await self._acquire(self._retrieval, "an embedding slot")
+                    self.counters[level.value] += 1
+                    try:
+                        return await retrieval_only(), level
+                    finally:
+                        self._retrieval.release()
+                finally:
+                    self.pending_retrieval_only -= 1
+
+            self.queued += 1
+            try:
+                await self._acquire(self._queries, "a query slot")
+            finally:
+                self.queued -= 1
+
+            self.counters[level.value] += 1
+            self.active_queries += 1
+            try:
+                return await answer(), level
+            finally:
+                self.active_queries -= 1
+                self._queries.release()
+        finally:
+            _current_budget.reset(token)
+
+    @asynccontextmanager
+    async def llm_call(self) -> AsyncIterator[None]:
+        """
+        Ocupa un slot LLM durante una llamada real al modelo.
+
+        El slot se libera también si la llamada falla o se cancela (p. ej. el
+        sub-agente perdedor de una petición especulativa).
+
+        Raises:
+            OverloadedException: Si la espera del slot expira
+        """
+        self.waiting_llm += 1
+        try:
+            await self._acquire(self._llm, "an LLM slot")
+        finally:
+            self.waiting_llm -= 1
+
+        self.inflight_llm += 1
+        try:
+            yield
+        finally:
+            self.inflight_llm -= 1
+            self._llm.release()
+
+    @contextmanager
+    def track_embedding(self) -> Iterator[None]:
+        """Cuenta una llamada de embeddings en curso (segura entre hilos)."""
+        with self._lock:
+            self.inflight_embeddings += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.inflight_embeddings -= 1
+
+    def stats(self) -> dict:
+        """
+        Obtiene el estado actual del controlador.
+
+        Returns:
+            Dict con slots, cola, consultas y llamadas en curso y contadores
+            por nivel
+        """
+        return {
+            "llm_slots": self.llm_slots,
+            "queued": self.queued,
+            "active_queries": self.active_queries,
+            "waiting_llm": self.waiting_llm,
+            "inflight_llm": self.inflight_llm,
+            "pending_retrieval_only": self.pending_retrieval_only,
+            "inflight_embeddings": self.inflight_embeddings,
+            **self.counters,
+        }
+
+
+@lru_cache
+def get_admission_controller() -> AdmissionController:
+    """
+    Obtiene el controlador de admisión compartido por el proceso.
+
+    Returns:
+        AdmissionController: Instancia singleton
+    """
+    return AdmissionController(get_settings())
+
+
+async def simulate_load(
+    controller: AdmissionController,
+    requests: int,
+    backend_delay: float = 1.0,
+    arrival_interval: float = 0.05,
+) -> dict:
+    """
+    Somete al controlador a una ráfaga contra un backend lento simulado.
+
+    Args:
+        controller: Controlador a probar
+        requests: Número de consultas de la ráfaga
+        backend_delay: Segundos que tarda cada llamada LLM simulada
+        arrival_interval: Segundos entre llegadas de consultas
+
+    Returns:
+        Dict con el resultado de cada nivel, latencias máximas y estado final
+    """
+    outcomes: dict[str, int] = {}
+    max_latency: dict[str, float] = {}
+
+    async def slow_backend() -> str:
+        async with controller.llm_call():
+            await asyncio.sleep(backend_delay)
+        return ""
+
+    async def fast_retrieval() -> str:
+        with controller.track_embedding():
+            await asyncio.sleep(backend_delay / 10)
+        return ""
+
+    async def one_request() -> None:
+        start = time.perf_counter()
+        try:
+            _, level = await controller.submit(slow_backend, fast_retrieval)
+            outcome = level.value
+        except OverloadedException:
+            outcome = "shed"
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        latency = time.perf_counter() - start
+        max_latency[outcome] = max(max_latency.get(outcome, 0.0), round(latency, 3))
+
+    tasks = []
+    for _ in range(requests):
+        tasks.append(asyncio.create_task(one_request()))
+        await asyncio.sleep(arrival_interval)
+    await asyncio.gather(*tasks)
+
+    return {"outcomes": outcomes, "max_latency_seconds": max_latency, **controller.stats()}
@@ -0,0 +1,227 @@
+"""
+Modo batch: responde preguntas leídas de un archivo JSONL.
+
+Este módulo ejecuta las preguntas contra el runner con concurrencia
+acotada, escribe cada resultado en cuanto está listo y permite reanudar
+tras una caída.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.exceptions.exceptions import AgentException
+from src.utils.admission import LoadLevel
+
+logger = logging.getLogger(__name__)
+
+_ID_FIELDS = ("id", "request_id", "question_id")
+_QUESTION_FIELDS = ("question", "query", "prompt")
+
+
+@dataclass(frozen=True)
+class BatchQuestion:
+    """
+    Pregunta a procesar en modo batch.
+
+    Attributes:
+        id: Identificador estable usado para reanudar
+        question: Texto de la pregunta
+    """
+
+    id: str
+    question: str
+
+
+def load_questions(input_path: Path) -> list[BatchQuestion]:
+    """
+    Lee las preguntas de un archivo JSONL.
+
+    Cada línea debe tener un id (`id`, `request_id` o `question_id`; si no,
+    se usa el número de línea) y el texto en `question`, `query` o `prompt`,
+    o bien en `title`/`body` como en `requests.jsonl`.
+
+    Args:
+        input_path: Archivo JSONL de entrada
+
+    Returns:
+        Lista de preguntas
+
+    Raises:
+        AgentException: Si el archivo no existe o una línea no es válida
+    """
+    if not input_path.is_file():
+        raise AgentException(f"Batch input file does not exist: {input_path}")
+
+    questions: list[BatchQuestion] = []
+    with input_path.open(encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise AgentException(f"Invalid JSON at {input_path}:{line_number}: {e}") from e
+
+            question_id = next(
+                (str(record[k]) for k in _ID_FIELDS if record.get(k) is not None),
+                f"line-{line_number}",
+            )
+            text = next((record[k] for k in _QUESTION_FIELDS if record.get(k)), None)
+            if text is None:
+                text = "\n\n".join(record[k] for k in ("title", "body") if record.get(k))
+            if not text:
+                raise AgentException(f"No question text at {input_path}:{line_number}")
+
+            questions.append(BatchQuestion(id=question_id, question=text))
+    return questions
+
+
+def load_completed_ids(output_path: Path) -> set[str]:
+    """
+    Obtiene los ids ya respondidos correctamente en un archivo de salida.
+
+    Las líneas incompletas (p. ej. por una caída a mitad de escritura) y las
+    respuestas degradadas por carga se ignoran, por lo que esas preguntas se
+    vuelven a procesar.
+
+    Args:
+        output_path: Archivo JSONL de resultados
+
+    Returns:
+        Conjunto de ids con status "ok" y nivel de servicio normal
+    """
+    completed: set[str] = set()
+    if not output_path.is_file():
+        return completed
+
+    with output_path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok" and record.get("level") == LoadLevel.NORMAL.value:
+                completed.add(record["id"])
+    return completed
+
+
+def latency_summary(latencies: list[float]) -> dict[str, float]:
+    """
+    Calcula la distribución de latencias.
+
+    Args:
+        latencies: Latencias en segundos
+
+    Returns:
+        Dict con mean, p50, p90, p99 y max en segundos
+    """
+    if not latencies:
+        return {}
+    if len(latencies) == 1:
+        value = latencies[0]
+        return {"mean": value, "p50": value, "p90": value, "p99": value, "max": value}
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "mean": statistics.fmean(latencies),
+        "p50": percentiles[49],
+        "p90": percentiles[89],
+        "p99": percentiles[98],
+        "max": max(latencies),
+    }
+
+
+async def run_batch(
+    answer_query: Callable[[str], Awaitable[tuple[str, LoadLevel]]],
+    input_path: Path,
+    output_path: Path,
+    concurrency: int,
+) -> dict:
+    """
+    Procesa un archivo JSONL de preguntas y escribe las respuestas.
+
+    Un pool de `concurrency` workers toma las preguntas pendientes de una en
+    una, de modo que una pregunta lenta solo ocupa su worker y no detiene al
+    resto. Cada resultado se añade al archivo de salida en cuanto termina,
+    con el nivel de servicio aplicado; las respuestas degradadas se vuelven
+    a procesar al reanudar.
+
+    Args:
+        answer_query: Función que responde una pregunta y devuelve también el
+            nivel de servicio (runner detrás del control de admisión)
+        input_path: Archivo JSONL de preguntas
+        output_path: Archivo JSONL de resultados (se reanuda si existe)
+        concurrency: Máximo de consultas simultáneas
+
+    Returns:
+        Resumen con conteos, throughput (preguntas/minuto) y latencias
+    """
+    questions = load_questions(input_path)
+    completed = load_completed_ids(output_path)
+    pending = [q for q in questions if q.id not in completed]
+    logger.info(
+        f"Batch: {len(questions)} questions, {len(completed)} already done, "
+        f"{len(pending)} pending"
+    )
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    queue = iter(pending)
+    write_lock = asyncio.Lock()
+    latencies: list[float] = []
+    errors = 0
+    degraded = 0
+
+    with output_path.open("a", encoding="utf-8") as output:
+
+        async def answer(item: BatchQuestion) -> None:
+            nonlocal errors, degraded
+            start = time.perf_counter()
+            record = {"id": item.id, "question": item.question}
+            try:
+                record["answer"], level = await answer_query(item.question)
+                record["status"] = "ok"
+                record["level"] = level.value
+                if level is not LoadLevel.NORMAL:
+                    degraded += 1
+            except Exception as e:
+                logger.error(f"Batch question {item.id} failed: {e}")
+                record["status"] = "error"
+                record["error"] = str(e)
+                errors += 1
+            latency = time.perf_counter() - start
+            record["latency_seconds"] = round(latency, 3)
+            latencies.append(latency)
+
+            async with write_lock:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+                os.fsync(output.fileno())
+
+        async def worker() -> None:
+            for item in queue:
+                await answer(item)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+        elapsed = time.perf_counter() - start
+
+    processed = len(latencies)
+    summary = {
+        "total": len(questions),
+        "skipped": len(questions) - len(pending),
+        "processed": processed,
+        "errors": errors,
+        "degraded": degraded,
+        "elapsed_seconds": round(elapsed, 3),
+        "questions_per_minute": round(processed / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "latency_seconds": {k: round(v, 3) for k, v in latency_summary(latencies).items()},
+    }
+    logger.info(f"Batch finished: {summary}")
+    return summary
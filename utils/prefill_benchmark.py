@@ -0,0 +1,128 @@
+"""
+Medición del ahorro de prefill por reutilización del prefijo del prompt.
+
+Este módulo envía a Ollama varias peticiones que comparten el mismo system
+prompt y compara el tiempo de procesamiento del prompt (prefill) de la
+primera petición, con caché fría, frente al de las siguientes. Además de
+repetir el mismo prompt seguido (mejor caso), mide una secuencia que
+alterna los prompts como en el flujo real (orquestador, sub-agente,
+orquestador...), donde el prefijo anterior en el slot de Ollama es otro.
+"""
+
+import uuid
+
+import requests
+
+from src.config.settings import Settings
+from src.exceptions.exceptions import OllamaNotRunningException
+
+_SAMPLE_QUESTIONS = (
+    "¿Qué es el aprendizaje supervisado?",
+    "Resume las ventajas de Python para ciencia de datos.",
+    "¿Cómo se evalúa un modelo de clasificación?",
+)
+
+
+def _chat(settings: Settings, system_prompt: str, question: str) -> dict:
+    """
+    Envía una petición mínima a Ollama y devuelve sus métricas.
+
+    Args:
+        settings: Configuración del sistema
+        system_prompt: System prompt de la petición
+        question: Mensaje del usuario
+
+    Returns:
+        Respuesta JSON de Ollama con prompt_eval_count y prompt_eval_duration
+
+    Raises:
+        OllamaNotRunningException: Si Ollama no responde
+    """
+    try:
+        response = requests.post(
+            f"{settings.ollama_base_url}/api/chat",
+            json={
+                "model": settings.ollama_llm_model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": question},
+                ],
+                "stream": False,
+                "keep_alive": settings.ollama_keep_alive,
+                "options": {"num_ctx": settings.ollama_num_ctx, "num_predict": 1},
+            },
+            timeout=300,
+        )
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        raise OllamaNotRunningException(
+            f"Ollama no respondió en {settings.ollama_base_url}: {e}"
+        ) from e
+
+
+def _prefill(responses: list[dict]) -> tuple[float, float]:
+    """Calcula la media de milisegundos y tokens de prefill de varias respuestas."""
+    ms = sum(r.get("prompt_eval_duration", 0) for r in responses) / len(responses) / 1e6
+    tokens = sum(r.get("prompt_eval_count", 0) for r in responses) / len(responses)
+    return ms, tokens
+
+
+def measure_prefix_reuse(settings: Settings, prompts: dict[str, str]) -> list[dict]:
+    """
+    Mide el prefill ahorrado al reutilizar cada system prompt.
+
+    Para cada prompt se antepone un nonce único, de modo que la primera
+    petición no encuentra el prefijo en caché. Después se mide:
+
+    - repetido: el mismo prompt varias veces seguidas, el mejor caso posible
+    - alterno: los prompts en secuencia (en el orden de `prompts`), de modo
+      que cada petición sigue a una con otro prefijo, como ocurre cuando
+      orquestador y sub-agentes comparten el mismo modelo de Ollama
+
+    El ahorro se calcula con la secuencia alterna, que es la que refleja el
+    uso real.
+
+    Args:
+        settings: Configuración del sistema
+        prompts: Dict con nombre -> system prompt estático
+
+    Returns:
+        Lista de resultados por prompt con tokens y milisegundos de prefill
+        en frío, repetido y alterno, y el ahorro obtenido
+
+    Raises:
+        OllamaNotRunningException: Si Ollama no responde
+    """
+    system_prompts = {name: f"[{uuid.uuid4().hex}]\n{prompt}" for name, prompt in prompts.items()}
+
+    cold: dict[str, dict] = {}
+    repeated: dict[str, list[dict]] = {}
+    for name, system_prompt in system_prompts.items():
+        cold[name] = _chat(settings, system_prompt, _SAMPLE_QUESTIONS[0])
+        repeated[name] = [_chat(settings, system_prompt, q) for q in _SAMPLE_QUESTIONS[1:]]
+
+    interleaved: dict[str, list[dict]] = {name: [] for name in system_prompts}
+    for question in _SAMPLE_QUESTIONS:
+        for name, system_prompt in system_prompts.items():
+            interleaved[name].append(_chat(settings, system_prompt, question))
+
+    results: list[dict] = []
+    for name in system_prompts:
+        cold_ms = cold[name].get("prompt_eval_duration", 0) / 1e6
+        repeated_ms, repeated_tokens = _prefill(repeated[name])
+        interleaved_ms, interleaved_tokens = _prefill(interleaved[name])
+        results.append(
+            {
+                "prompt": name,
+                "cold_prompt_tokens": cold[name].get("prompt_eval_count", 0),
+                "cold_prefill_ms": round(cold_ms, 1),
+                "repeated_prompt_tokens": round(repeated_tokens, 1),
+                "repeated_prefill_ms": round(repeated_ms, 1),
+                "interleaved_prompt_tokens": round(interleaved_tokens, 1),
+                "interleaved_prefill_ms": round(interleaved_ms, 1),
+                "saved_ms": round(cold_ms - interleaved_ms, 1),
+                "saved_pct": round((1 - interleaved_ms / cold_ms) * 100, 1) if cold_ms else 0.0,
+            }
+        )
+    return results